@@ -1,25 +1,58 @@
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from typing import Any, Dict, Optional, List
+import asyncio
 import logging
-from datetime import datetime
+import orjson
+import time
 
-from src.services.data_service import MLBDataService
+from src.services.data_service import MLBDataService, get_default_service
 from src.services.ai_analyzer import BaseballAnalyzer
+from src.utils import now_str
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-mlb_service = MLBDataService()
-analyzer = BaseballAnalyzer()
+mlb_service = get_default_service()
+analyzer = BaseballAnalyzer(data_service=mlb_service)
 
 
-@router.get("/analyze/{player_name}")
-def analyze_player(
+def get_mlb_service() -> MLBDataService:
+    """Shared MLB data service; override in tests via app.dependency_overrides"""
+    return mlb_service
+
+
+def get_analyzer() -> BaseballAnalyzer:
+    """Shared analyzer; override in tests via app.dependency_overrides"""
+    return analyzer
+
+
+class AnalysisResponse(BaseModel):
+    player: str
+    analysis: str
+    cached: bool
+    model: str
+    player_info: Dict[str, Any] = {}
+    data_source: str = "MLB API"
+    last_updated: Optional[str] = None
+    query_timestamp: str
+    recent_performance: Optional[Dict[str, Any]] = None
+
+
+@router.get(
+    "/analyze/{player_name}",
+    response_model=AnalysisResponse,
+    response_model_exclude_none=True,
+)
+async def analyze_player(
     player_name: str,
     season: Optional[int] = Query(None, description="Specific season to analyze"),
     include_recent: bool = Query(True, description="Include recent games in analysis"),
+    mlb_service: MLBDataService = Depends(get_mlb_service),
+    analyzer: BaseballAnalyzer = Depends(get_analyzer),
 ):
     """
     Analyze a player's performance with real MLB data
@@ -38,11 +71,11 @@ def analyze_player(
         cleaned_name = player_name.strip().title()
 
         logger.info(f"Analyzing player: {cleaned_name}")
-        player_data = mlb_service.get_player_data(cleaned_name)
+        player_data = await mlb_service.get_player_data_async(cleaned_name)
 
         if not player_data:
 
-            similar_players = mlb_service.search_players(cleaned_name)
+            similar_players = await run_in_threadpool(mlb_service.search_players, cleaned_name)
             suggestions = [p.get("fullName", "") for p in similar_players[:3]]
 
             error_details = {
@@ -51,28 +84,29 @@ def analyze_player(
                 "suggestions": suggestions if suggestions else "No similar players found",
                 "tip": "Try searching for a similar player or check for typos",
             }
-            return HTTPException(status_code=404, detail=error_details)
+            raise HTTPException(status_code=404, detail=error_details)
 
         logger.info(f"Generating AI analysis for: {cleaned_name}")
-        analysis = analyzer._analyze_player_performance(cleaned_name, player_data)
-
-        response_data = {
-            "player": cleaned_name,
-            "analysis": analysis,
-            "player_info": player_data.get("playerInfo", {}),
-            "data_source": "MLB API",
-            "last_updated": player_data.get("last_updated"),
-            "query_timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        }
+        analysis, cached = await analyzer._analyze_player(cleaned_name, player_data)
 
+        recent_performance = None
         if include_recent:
-            response_data["recent_performance"] = {
+            recent_performance = {
                 "summary": player_data.get("recent_games"),
                 "season_stats": player_data.get("season_stats"),
                 "advanced_metrics": player_data.get("advanced"),
             }
 
-        return response_data
+        return AnalysisResponse(
+            player=cleaned_name,
+            analysis=analysis,
+            cached=cached,
+            model=analyzer.model,
+            player_info=player_data.get("player_info", {}),
+            last_updated=player_data.get("last_updated"),
+            query_timestamp=now_str(),
+            recent_performance=recent_performance,
+        )
 
     except HTTPException:
         raise
@@ -88,8 +122,48 @@ def analyze_player(
         )
 
 
+@router.get("/analyze/{player_name}/stream")
+async def stream_player_analysis(
+    player_name: str,
+    mlb_service: MLBDataService = Depends(get_mlb_service),
+    analyzer: BaseballAnalyzer = Depends(get_analyzer),
+):
+    """
+    Stream a player's AI analysis as server-sent events
+
+    Each event's data is a JSON-encoded text chunk; a final "done" event closes the
+    stream.
+
+    Args:
+        player_name: Player's name (e.g., "Mike Trout", "Shohei Ohtani")
+    """
+    if not player_name or len(player_name.strip()) < 2:
+        raise HTTPException(
+            status_code=400, detail="Player name must be at least 2 characters long"
+        )
+
+    cleaned_name = player_name.strip().title()
+    player_data = await mlb_service.get_player_data_async(cleaned_name)
+    if not player_data:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": "Player not found", "searched_name": cleaned_name},
+        )
+
+    async def events():
+        async for chunk in analyzer._stream_player_analysis(cleaned_name, player_data):
+            yield b"data: " + orjson.dumps(chunk) + b"\n\n"
+        yield b"event: done\ndata: {}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @router.get("/search/{query}")
-def search_players(query: str, limit: int = Query(5, ge=1, le=20)):
+async def search_players(
+    query: str,
+    limit: int = Query(5, ge=1, le=20),
+    mlb_service: MLBDataService = Depends(get_mlb_service),
+):
     """
     Search for players by name
 
@@ -103,7 +177,7 @@ def search_players(query: str, limit: int = Query(5, ge=1, le=20)):
                 status_code=400, detail="Search query must be at least 2 characters long"
             )
 
-        players = mlb_service.search_players(query)
+        players = await run_in_threadpool(mlb_service.search_players, query)
 
         results = []
         for player in players[:limit]:
@@ -121,7 +195,7 @@ def search_players(query: str, limit: int = Query(5, ge=1, le=20)):
             "query": query,
             "results": results,
             "total_found": len(results),
-            "search_timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "search_timestamp": now_str(),
         }
 
     except HTTPException:
@@ -139,12 +213,14 @@ def search_players(query: str, limit: int = Query(5, ge=1, le=20)):
 
 
 @router.get("/player/{player1}/{player2}")
-def compare_players(
+async def compare_players(
     player1: str,
     player2: str,
     stat_focus: str = Query(
         "batting", description="Statistic to focus on (batting, pitching or both)"
     ),
+    mlb_service: MLBDataService = Depends(get_mlb_service),
+    analyzer: BaseballAnalyzer = Depends(get_analyzer),
 ):
     """
     Compare two players' performance
@@ -156,29 +232,21 @@ def compare_players(
     """
     try:
 
-        first_player_data = mlb_service.get_player_data(player1)
-        second_player_data = mlb_service.get_player_data(player2)
+        first_player_data, second_player_data = await asyncio.gather(
+            mlb_service.get_player_data_async(player1),
+            mlb_service.get_player_data_async(player2),
+        )
 
         if not first_player_data:
             raise HTTPException(status_code=404, detail=f"Player {player1} not found")
 
         if not second_player_data:
             raise HTTPException(status_code=404, detail=f"Player {player2} not found")
-        comparison_prompt = f"""
-        Compare these two players:
-        
-        Player 1: {player1.title()}
-        {first_player_data.get('season_stats', 'Stats unavailable')}
-        Recent: {first_player_data.get('recent_games', 'No recent data')}
-        Advanced: {first_player_data.get('advanced', 'No advanced metrics')}
-        
-        Player 2: {player2.title()}
-        {second_player_data.get('season_stats', 'Stats unavailable')}
-        Recent: {second_player_data.get('recent_games', 'No recent data')}
-        Advanced: {second_player_data.get('advanced', 'No advanced metrics')}
-        """
+        comparison_prompt = analyzer.format_comparison_data(
+            [(player1, first_player_data), (player2, second_player_data)]
+        )
 
-        comparison_analysis = analyzer._analyze_player_performance(
+        comparison_analysis = await analyzer._analyze_player_performance(
             f"{player1.title()} vs {player2.title()}", {"comparison_data": comparison_prompt}
         )
 
@@ -188,7 +256,7 @@ def compare_players(
             "first_player_info": first_player_data.get("player_info", {}),
             "second_player_info": second_player_data.get("player_info", {}),
             "data_source": "MLB API",
-            "comparison_timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "comparison_timestamp": now_str(),
         }
 
     except HTTPException:
@@ -206,7 +274,10 @@ def compare_players(
 
 
 @router.get("/team/{team_name}/roster")
-def get_team_roster(team_name: str):
+async def get_team_roster(
+    team_name: str,
+    mlb_service: MLBDataService = Depends(get_mlb_service),
+):
     """
     Get a team's currentroster
 
@@ -214,7 +285,7 @@ def get_team_roster(team_name: str):
         team_name: Team's name
     """
     try:
-        roster = mlb_service.get_team_roster(team_name)
+        roster = await run_in_threadpool(mlb_service.get_team_roster, team_name)
 
         if not roster:
             raise HTTPException(status_code=404, detail=f"Team {team_name} not found")
@@ -224,7 +295,7 @@ def get_team_roster(team_name: str):
             "roster": roster,
             "roster_size": len(roster),
             "data_source": "MLB Official Stats API",
-            "retrieved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "retrieved_at": now_str(),
         }
 
     except HTTPException:
@@ -242,34 +313,60 @@ def get_team_roster(team_name: str):
 
 
 @router.get("/health")
-def health_check():
+async def health_check():
     """
-    Check the health of the API
+    Liveness check: the API process is up and serving requests
+
+    Makes no external calls, so load balancers can probe it as often as they like.
     """
-    try:
-        test_result = mlb_service.search_players("test")
+    return {"status": "healthy", "timestamp": now_str()}
 
-        return {
-            "status": "healthy",
-            "mlb_api_status": "connected",
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        }
 
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
+# Last MLB API probe result, reused for READINESS_CACHE_SECONDS
+READINESS_CACHE_SECONDS = 30
+_readiness = {"checked_at": None, "error": None}
+
+
+@router.get("/health/ready")
+async def readiness_check(mlb_service: MLBDataService = Depends(get_mlb_service)):
+    """
+    Readiness check: the MLB Stats API is reachable
+
+    The upstream probe runs at most once every READINESS_CACHE_SECONDS.
+    """
+    checked_at = _readiness["checked_at"]
+    if checked_at is None or time.monotonic() - checked_at >= READINESS_CACHE_SECONDS:
+        try:
+            await run_in_threadpool(mlb_service.check_connection)
+            _readiness["error"] = None
+        except Exception as e:
+            logger.error(f"Readiness check failed: {str(e)}")
+            _readiness["error"] = str(e)
+        _readiness["checked_at"] = time.monotonic()
+
+    if _readiness["error"]:
         return JSONResponse(
             status_code=503,
             content={
                 "status": "unhealthy",
                 "mlb_api_status": "disconnected",
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "error": str(e),
+                "timestamp": now_str(),
+                "error": _readiness["error"],
             },
         )
 
+    return {
+        "status": "healthy",
+        "mlb_api_status": "connected",
+        "timestamp": now_str(),
+    }
+
 
 @router.post("/chat")
-def chat_about_baseball(question: str):
+async def chat_about_baseball(
+    question: str,
+    analyzer: BaseballAnalyzer = Depends(get_analyzer),
+):
     """
     Answer natural language questions about baseball players
     
@@ -280,12 +377,12 @@ def chat_about_baseball(question: str):
     """
     try:
         # Use AI to parse the question and extract player names and stats
-        response = analyzer._answer_baseball_question(question)
+        response = await analyzer._answer_baseball_question(question)
         
         return {
             "question": question,
             "answer": response,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": now_str(),
         }
         
     except Exception as e:
@@ -301,7 +398,7 @@ def chat_about_baseball(question: str):
 
 
 @router.get("/")
-def root():
+async def root():
     """
     Root endpoint with API information
     """
@@ -311,12 +408,14 @@ def root():
         "version": "1.0.0",
         "endpoints": {
             "analyze": "/analyze/{player_name} - Get AI analysis of a player",
+            "analyze_stream": "/analyze/{player_name}/stream - Stream AI analysis of a player",
             "search": "/search/{query} - Search for players",
             "compare": "/compare/{player1}/{player2} - Compare two players",
             "roster": "/team/{team_name}/roster - Get team roster",
             "chat": "/chat - Answer natural language questions about players",
-            "health": "/health - API health check",
+            "health": "/health - API liveness check",
+            "ready": "/health/ready - MLB API connectivity check",
         },
         "data_source": "MLB Official Stats API",
-        "powered_by": "OpenAI GPT-4",
+        "powered_by": "OpenAI GPT-4o",
     }
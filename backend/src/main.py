@@ -1,20 +1,81 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+
+import uvicorn
 from fastapi import FastAPI
-from src.api.routes import router
+from fastapi.concurrency import run_in_threadpool
+from src.api.routes import router, mlb_service
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI(title="Line Drive AI", description="Analyze MLB player performance")
+logger = logging.getLogger(__name__)
+
+PLAYER_INDEX_REFRESH_SECONDS = 24 * 60 * 60
+# A failed load is retried soon, backing off up to half an hour, rather than a day later
+PLAYER_INDEX_RETRY_SECONDS = 30
+PLAYER_INDEX_MAX_RETRY_SECONDS = 30 * 60
+
+
+async def _refresh_player_index_daily():
+    """Keep the active player name index current; it only changes with roster moves"""
+    retry_delay = PLAYER_INDEX_RETRY_SECONDS
+    while True:
+        loaded = await run_in_threadpool(mlb_service.refresh_active_players)
+        if loaded:
+            retry_delay = PLAYER_INDEX_RETRY_SECONDS
+            await asyncio.sleep(PLAYER_INDEX_REFRESH_SECONDS)
+        else:
+            logger.warning(f"Player index not loaded, retrying in {retry_delay}s")
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, PLAYER_INDEX_MAX_RETRY_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    refresh_task = asyncio.create_task(_refresh_player_index_daily())
+    yield
+    refresh_task.cancel()
+    mlb_service.close()
+
+
+app = FastAPI(
+    title="Line Drive AI",
+    description="Analyze MLB player performance",
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
+    # Let browsers reuse a preflight for 10 minutes
+    max_age=600,
 )
 
 app.include_router(router)
 
 
 @app.get("/")
-def root():
+async def root():
     return {"message": "Line Drive AI!"}
+
+
+def serve():
+    """
+    Run the API with uvicorn
+
+    loop/http "auto" select uvloop and httptools when they are installed (they are
+    project dependencies everywhere except Windows). Set WEB_CONCURRENCY to run
+    several worker processes.
+    """
+    uvicorn.run(
+        "src.main:app",
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="auto",
+        http="auto",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
@@ -1,25 +1,496 @@
+import asyncio
+import contextlib
+import diskcache
+import functools
+import hashlib
+import httpx
+import json
+import math
+import operator
 import openai
 import os
+import random
+import re
+import textwrap
+import time
+import weakref
 from dotenv import load_dotenv
 import logging
-from typing import Dict, Any
-from datetime import datetime
+from cachetools import TLRUCache
+from typing import Dict, Any, AsyncIterator, FrozenSet, List, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
+
+from src.services.data_service import DEFAULT_CACHE_DIR, MLBDataService, _clean_word, _fold_name
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# Keep-alive pool shared by every analysis request so the TLS handshake is paid once
+_OPENAI_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Rough prompt size estimate used by the rate limiter (English text ~4 chars/token)
+_CHARS_PER_TOKEN = 4
+
+# Retry backoff (seconds): base * 2**attempt capped at max, plus random jitter
+_BASE_BACKOFF = 0.5
+_MAX_BACKOFF = 8.0
+_BACKOFF_JITTER = 0.25
+
+# Patterns used on every chat question, compiled once
+_STATS_RE = re.compile(r"(?P<hr>\d+) HR|(?P<avg>\.\d+) avg|(?P<rbi>\d+) RBI")
+
+# Question keyword -> stat, checked in order (home runs win over average, then RBI)
+_STAT_INTENTS = {
+    "hr": "hr", "home run": "hr", "homer": "hr",
+    "avg": "avg", "average": "avg", "batting": "avg",
+    "rbi": "rbi", "runs batted in": "rbi", "runs batted": "rbi",
+}
+_QA_SYSTEM_PROMPT = "Extract the requested MLB stat. Reply in one sentence."
+
+_STAT_ANSWERS = {
+    "hr": "{player} has {value} home runs this season (2025). Full stats: {stats}",
+    "avg": "{player} is batting {value} this season. Full stats: {stats}",
+    "rbi": "{player} has {value} RBIs this season. Full stats: {stats}",
+}
+_NAME_SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv"})
+_MAX_NAME_WORDS = 4
+
+# Expanded stop words - common phrases that are definitely not player names
+_STOP_PHRASES = frozenset({
+    # Baseball terms
+    'home runs', 'batting average', 'runs batted', 'earned run', 'run average',
+    # Question words
+    'how many', 'what is', 'who has', 'can you', 'do you', 'will you',
+    # Common verbs + pronouns
+    'you do', 'you can', 'you analyze', 'analyze you',
+    'do connor', 'can trevor', 'you trevor', 'analyze trevor', 'trevor analyze',
+    # Common sentence starters
+    'now can', 'can now', 'now you', 'you now', 'then can', 'can then',
+    # Single common words (when they appear in 2-word combos with names)
+    'the', 'and', 'but', 'for', 'with', 'about', 'now', 'then', 'can', 'you', 'do', 'will', 'would', 'please', 'thank you', 'thank',
+})
+
+# Leading words that mark a two-word window as a command, not a name
+_COMMAND_WORDS = frozenset({'do', 'can', 'will', 'would', 'please', 'now', 'then', 'you'})
+
+# Prompt templates, compiled once at import; only the placeholders vary per request.
+# The instructions go in a system message that is identical on every call, so the
+# user message carries only the player data.
+_ANALYSIS_SYSTEM_PROMPT = textwrap.dedent("""\
+    You are a professional baseball analyst with expertise in modern analytics and player evaluation. You will be given a player's current performance data to analyze.
+
+    ANALYSIS REQUIREMENTS:
+    Provide a comprehensive analysis covering:
+
+    1. **Current Form Assessment**: Evaluate recent performance trends and hot/cold streaks
+    2. **Season Performance**: How they're performing relative to expectations and career norms
+    3. **Strengths & Concerns**: Key positive trends and areas of worry
+    4. **Fantasy/Betting Insights**: Actionable insights for fantasy players and sports bettors
+    5. **Key Takeaway**: One-sentence bottom line assessment
+
+    IMPORTANT GUIDELINES:
+    - Use specific statistical context when available
+    - Compare to league averages where relevant (league avg batting ~.248, ERA ~4.00)
+    - Consider position and age context
+    - Be engaging but analytically rigorous
+    - Keep total response under 240 words
+    - Focus on actionable insights
+    """)
+
+_ANALYSIS_TEMPLATE = textwrap.dedent("""\
+    Analyze this player's current performance:
+
+    Player: {player_name}
+    Date: {date}
+
+    PERFORMANCE DATA:
+    Recent Games: {recent_games}
+    Season Stats: {season_stats}
+    Context: {context}
+    Advanced Metrics: {advanced}
+
+    PLAYER INFO:
+    Position: {position}
+    Team: {team}
+    Age: {age}
+    """)
+
+_COMPARISON_SYSTEM_PROMPT = textwrap.dedent("""\
+    You are a professional baseball analyst. You will be given stats for several players; provide a detailed comparison analysis.
+
+    COMPARISON ANALYSIS REQUIREMENTS:
+    1. **Head-to-Head Stats**: Direct statistical comparison
+    2. **Strengths of Each Player**: What each player does better
+    3. **Current Form**: Who's performing better recently
+    4. **Context Considerations**: Age, team, position factors
+    5. **Bottom Line**: Which player you'd prefer and why
+
+    Keep analysis under 160 words and focus on practical insights for fantasy and betting decisions.
+    """)
+
+_COMPARISON_TEMPLATE = "Compare these players:\n\n{comparison_data}"
+_COMPARISON_PLAYER_BLOCK = "Player {number}: {name}\n{season}\nRecent: {recent}\nAdvanced: {advanced}\n"
+
+# Several players in one completion; the model answers with a JSON object
+_MULTI_ANALYSIS_SYSTEM_PROMPT = textwrap.dedent("""\
+    You are a professional baseball analyst with expertise in modern analytics and player evaluation. You will be given data for several players; analyze each one.
+
+    For each player cover current form, season performance, strengths and concerns, and one fantasy/betting takeaway. Compare to league averages where relevant (league avg batting ~.248, ERA ~4.00) and keep each analysis under 150 words.
+
+    Respond with a JSON object of the form {"analyses": {"<player name>": "<analysis>"}}, with one entry per player, using the names exactly as written in the data.
+    """)
+_MULTI_ANALYSIS_TEMPLATE = "Analyze each player below ({date}).\n\n{players}"
+_MULTI_ANALYSIS_PLAYER_BLOCK = (
+    "Player: {name}\nPosition: {position} | Team: {team} | Age: {age}\n"
+    "Season: {season}\nRecent: {recent}\nContext: {context}\nAdvanced: {advanced}\n"
+)
+# Players per combined request, and the completion budget each one adds
+_MULTI_ANALYSIS_SIZE = 6
+_MULTI_ANALYSIS_TOKENS_PER_PLAYER = 250
+
+# Per-field character budgets so oversized stat strings can't balloon prompt tokens
+_PROMPT_FIELD_CHARS = 400
+_COMPARISON_DATA_CHARS = 2000
+
+# Exact-match cache of completions, keyed per UTC day so analyses refresh daily.
+# Entries also expire with the season stats they were generated from (30 minutes).
+_RESPONSE_CACHE_SIZE = 1024
+_RESPONSE_TTL_SECONDS = 30 * 60
+# Values are (ttl_seconds, content); each entry expires ttl after it was stored
+_response_cache: "TLRUCache[str, Tuple[float, str]]" = TLRUCache(
+    maxsize=_RESPONSE_CACHE_SIZE,
+    ttu=lambda key, value, now: now + value[0],
+    timer=lambda: time.monotonic(),
+)
+# Second tier on disk, shared by workers and kept across restarts
+_AI_CACHE_DIR = os.getenv("LINEDRIVE_AI_CACHE_DIR", os.path.join(DEFAULT_CACHE_DIR, "ai"))
+_AI_CACHE_SIZE_LIMIT = 2 ** 30
+
+
+# One client per event loop: the httpx pool's connections belong to the loop that
+# opened them, and analyze_many_sync runs each batch on a fresh loop
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, openai.AsyncOpenAI]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_client() -> openai.AsyncOpenAI:
+    """Return the running loop's AsyncOpenAI client, built on first use so imports don't need an API key"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = openai.AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            max_retries=0,
+            http_client=httpx.AsyncClient(limits=_OPENAI_POOL_LIMITS),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def _close_client() -> None:
+    """Close the running loop's client, if one was created"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
+
+def _backoff_delay(attempt: int, error: Optional[Exception] = None) -> float:
+    """Seconds to wait before the next attempt, preferring the server's Retry-After hint (capped)"""
+    response = getattr(error, "response", None)
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        try:
+            if retry_after is not None:
+                return min(_MAX_BACKOFF, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+
+    delay = min(_MAX_BACKOFF, _BASE_BACKOFF * (2 ** attempt))
+    return delay + random.random() * _BACKOFF_JITTER
+
+
+def _looks_like_name_part(word: str) -> bool:
+    return word[:1].isupper() or word.lower() in _NAME_SUFFIXES
+
+
+def _candidate_names(words: List[str], first_names: Optional[FrozenSet[str]]) -> List[str]:
+    """
+    Collect possible player names in one left-to-right walk over the words
+
+    A name starts at a known first name (taking the next word as the surname
+    whatever its case) or a capitalized word followed by another name part, then
+    extends over further capitalized words and suffixes (Jr, II, ...). Each run
+    contributes its 2-4 word windows, so "Aaron Judge Mike Trout" still yields
+    both names. Without a first-name list every word may start a name, which
+    degrades to the old adjacent-pair sweep.
+    """
+    candidates: List[str] = []
+    seen = set()
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if not word:
+            i += 1
+            continue
+        # The index stores folded first names, so "José" must fold to "jose" first
+        first_name = first_names is None or _fold_name(word) in first_names
+        if not (first_name or word[:1].isupper()):
+            i += 1
+            continue
+
+        run = [word]
+        j = i + 1
+        if j < len(words) and words[j] and (first_name or _looks_like_name_part(words[j])):
+            run.append(words[j])
+            j += 1
+            while j < len(words) and words[j] and _looks_like_name_part(words[j]):
+                run.append(words[j])
+                j += 1
+
+        for size in range(2, min(len(run), _MAX_NAME_WORDS) + 1):
+            for offset in range(len(run) - size + 1):
+                name = " ".join(run[offset:offset + size]).title()
+                if name not in seen:
+                    seen.add(name)
+                    candidates.append(name)
+
+        # With a real first-name list a run is consumed whole; when guessing, only
+        # advance one word so no adjacent pair is skipped
+        i = j if first_names is not None and len(run) > 1 else i + 1
+
+    return candidates
+
+
+@functools.lru_cache(maxsize=1)
+def _month_label(hour_bucket: int) -> str:
+    return datetime.now().strftime("%B %Y")
+
+
+def _current_month() -> str:
+    """Month label like "October 2026", recomputed at most once an hour"""
+    return _month_label(int(time.time() // 3600))
+
+
+def _clip(value: Any, limit: int = _PROMPT_FIELD_CHARS) -> str:
+    """Stringify a prompt field and cut it to the character budget"""
+    text = str(value)
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def _parse_season_stats(season_stats: str) -> Dict[str, str]:
+    """Pull HR/avg/RBI out of a formatted season stats line in one pass"""
+    stats = {}
+    for match in _STATS_RE.finditer(season_stats):
+        stats[match.lastgroup] = match.group(match.lastgroup)
+    return stats
+
+
+def _classify_stat_intent(question_lower: str) -> Optional[str]:
+    for keyword, stat in _STAT_INTENTS.items():
+        if keyword in question_lower:
+            return stat
+    return None
+
+
+def _response_cache_key(prompt: str, *params) -> str:
+    """Stable digest of the prompt, request parameters and current UTC day"""
+    day = datetime.now(timezone.utc).strftime("%Y%m%d")
+    raw = "|".join([day, *(str(p) for p in params), prompt])
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_disk_cache() -> diskcache.Cache:
+    return diskcache.Cache(_AI_CACHE_DIR, size_limit=_AI_CACHE_SIZE_LIMIT)
+
+
+def _read_disk_cache(key: str) -> Tuple[Optional[str], Optional[float]]:
+    return _get_disk_cache().get(key, expire_time=True)
+
+
+def _write_disk_cache(key: str, content: str, ttl: float) -> None:
+    _get_disk_cache().set(key, content, expire=ttl)
+
+
+async def _get_cached_response(key: str) -> Optional[str]:
+    entry = _response_cache.get(key)
+    if entry is not None:
+        return entry[1]
+
+    # Another worker (or an earlier run) may already have paid for this completion.
+    # diskcache is blocking SQLite I/O, so it runs off the event loop.
+    content, expire_time = await _run_blocking(_read_disk_cache, key)
+    if content is None:
+        return None
+    remaining = expire_time - time.time() if expire_time else _RESPONSE_TTL_SECONDS
+    _response_cache[key] = (remaining, content)
+    return content
+
+
+async def _store_cached_response(key: str, content: str, ttl: float = _RESPONSE_TTL_SECONDS) -> None:
+    _response_cache[key] = (ttl, content)
+    await _run_blocking(_write_disk_cache, key, content, ttl)
+
+
+def _precomputed_key(player_name: str, day: date) -> str:
+    """Cache key for a Batch API analysis: the player and the UTC day it was submitted"""
+    return f"precomputed|{day:%Y%m%d}|{_fold_name(player_name)}"
+
+
+async def _get_precomputed_analysis(player_name: str) -> Optional[str]:
+    """A batch analysis submitted today or yesterday (still inside its 24h window)"""
+    today = datetime.now(timezone.utc).date()
+    for day in (today, today - timedelta(days=1)):
+        content = await _get_cached_response(_precomputed_key(player_name, day))
+        if content is not None:
+            return content
+    return None
+
+
+class _SemanticCache:
+    """
+    Small in-process cache of question embeddings -> model answers
+
+    Each entry remembers which players it is about and expires with the stats it
+    was generated from. Vectors are unit length, so cosine similarity is a plain
+    dot product; lookups are pure Python, so callers run them off the event loop.
+    """
+
+    def __init__(self, max_entries: int = 256, threshold: float = 0.95):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        # (vector, folded player names, monotonic expiry, answer)
+        self._entries: List[Tuple[List[float], FrozenSet[str], float, str]] = []
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> List[float]:
+        norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+        return [x / norm for x in embedding]
+
+    @staticmethod
+    def _players(names: List[str]) -> FrozenSet[str]:
+        return frozenset(_fold_name(name) for name in names)
+
+    def lookup(self, embedding: List[float], names: List[str]) -> Optional[str]:
+        players = self._players(names)
+        now = time.monotonic()
+        # Only fresh answers about the same players are worth scoring
+        candidates = [
+            (vector, answer)
+            for vector, entry_players, expires_at, answer in list(self._entries)
+            if entry_players == players and expires_at > now
+        ]
+        if not candidates:
+            return None
+
+        query = self._normalize(embedding)
+        best_score, best_answer = 0.0, None
+        for vector, answer in candidates:
+            score = sum(map(operator.mul, query, vector))
+            if score > best_score:
+                best_score, best_answer = score, answer
+        return best_answer if best_score >= self.threshold else None
+
+    def store(self, embedding: List[float], names: List[str], answer: str, ttl: float) -> None:
+        now = time.monotonic()
+        self._entries = [entry for entry in self._entries if entry[2] > now]
+        self._entries.append(
+            (self._normalize(embedding), self._players(names), now + ttl, answer)
+        )
+        if len(self._entries) > self.max_entries:
+            del self._entries[0]
+
+
+_semantic_cache = _SemanticCache()
+
+# OpenAI Batch API states after which a batch will not change any more
+_BATCH_TERMINAL_STATES = frozenset({"completed", "failed", "expired", "cancelled"})
+# A batch may take its whole completion window, so its results are keyed by player
+# and submit day rather than by prompt, and kept for one more window
+_BATCH_WINDOW_SECONDS = 24 * 60 * 60
+
+
+class _TokenBucket:
+    """Tokens-per-minute budget that refills continuously; acquire waits for room"""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    async def acquire(self, amount: int) -> None:
+        # A single oversized request can still go through once the bucket is full
+        amount = min(float(amount), self.capacity)
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+async def _collect_stream(chunks: AsyncIterator[str]) -> str:
+    """Join a streamed completion back into one string for callers that need it whole"""
+    return "".join([chunk async for chunk in chunks]).strip()
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // _CHARS_PER_TOKEN + 1
+
+
+async def _run_blocking(func, *args):
+    """Run a blocking call (MLB API lookups) in the default executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args))
 
 
 class BaseballAnalyzer:
-    def __init__(self):
-        self.model = "gpt-4o"
+    def __init__(self, data_service: Optional[MLBDataService] = None):
+        # Shared so MLB lookups reuse one cache and player index across requests
+        self.data_service = data_service or MLBDataService()
+        # Routine single-player analyses run on the fast model; comparisons weigh
+        # players against each other and get the stronger one. Token budgets match
+        # the word limits in the system prompts (~0.75 words per token).
+        self.model = "gpt-4o-mini"
         self.temperature = 0.7
-        self.max_tokens = 300
-        self.max_retries = 2
+        self.max_tokens = 320
+        self.comparison_model = "gpt-4o"
+        self.comparison_max_tokens = 220
+        self.max_retries = 4
+        self.embedding_model = "text-embedding-3-small"
+        # Chat answers are short stat lookups; a small deterministic model is enough
+        self.qa_model = "gpt-4o-mini"
+        self.qa_temperature = 0
+        self.qa_max_tokens = 80
+        # A chat answer has a ready stats fallback, so it gets one quick try
+        self.qa_max_retries = 0
+        self.qa_timeout = 5.0
+        # Proactive limits, so concurrent requests queue here instead of collecting 429s
+        self.max_concurrency = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+        self._token_bucket = _TokenBucket(int(os.getenv("OPENAI_TPM_LIMIT", "30000")))
+        # One per event loop, created on first use: a semaphore can only be waited
+        # on from the loop it first blocked in
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
 
-    def _analyze_player_performance(self, player_name: str, player_data: Dict[str, Any]) -> str:
+    @contextlib.asynccontextmanager
+    async def _request_slot(self, prompt: str, max_tokens: int):
+        """Hold a concurrency slot and reserve the request's estimated tokens"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        async with semaphore:
+            await self._token_bucket.acquire(_estimate_tokens(prompt) + max_tokens)
+            yield
+
+    async def _analyze_player_performance(self, player_name: str, player_data: Dict[str, Any]) -> str:
         """
         Generate comprehensive AI analysis of player performance
 
@@ -30,22 +501,235 @@ class BaseballAnalyzer:
         Returns:
             AI-generated analysis string
         """
+        analysis, _ = await self._analyze_player(player_name, player_data)
+        return analysis
+
+    async def _analyze_player(self, player_name: str, player_data: Dict[str, Any]) -> Tuple[str, bool]:
+        """
+        _analyze_player_performance, plus whether the analysis came from the cache
+
+        The cache tiers are read once here and skipped by _get_ai_response, so the
+        flag always describes the analysis returned.
+        """
         try:
             if not self._validate_player_data(player_data):
-                return self._generate_fallback_analysis(player_name)
+                return self._generate_fallback_analysis(player_name), False
+
+            if "comparison_data" not in player_data:
+                precomputed = await _get_precomputed_analysis(player_name)
+                if precomputed is not None:
+                    return precomputed, True
 
             prompt = self._create_analysis_prompt(player_name, player_data)
+            model, max_tokens = self._completion_params(player_data)
+            system = self._system_prompt(player_data)
+
+            cache_key = _response_cache_key(prompt, model, self.temperature, max_tokens, system)
+            cached = await _get_cached_response(cache_key)
+            if cached is not None:
+                return cached, True
 
-            analysis = self._get_ai_response(prompt)
+            analysis = await self._get_ai_response(
+                prompt, model=model, max_tokens=max_tokens, system=system, check_cache=False
+            )
 
             if not analysis or len(analysis.strip()) < 50:
-                return self._generate_fallback_analysis(player_name)
+                return self._generate_fallback_analysis(player_name), False
 
-            return analysis
+            return analysis, False
 
         except Exception as e:
             logger.error(f"Error analyzing player {player_name}: {str(e)}")
-            return self._generate_error_analysis(player_name, str(e))
+            return self._generate_error_analysis(player_name, str(e)), False
+
+    async def analyze_many(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Analyze several players concurrently
+
+        The OpenAI requests overlap on the shared async client instead of running
+        one after another.
+
+        Args:
+            items: (player_name, player_data) pairs
+
+        Returns:
+            Analyses in the same order as items
+        """
+        return await asyncio.gather(
+            *(self._analyze_player_performance(name, data) for name, data in items)
+        )
+
+    async def analyze_batch(self, players: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, str]:
+        """
+        Analyze several players with one chat completion per group of players
+
+        Up to _MULTI_ANALYSIS_SIZE players share a request that asks for a JSON
+        object of analyses, so a roster costs a handful of requests instead of one
+        per player. Players whose single analysis is already cached reuse it, and
+        any player missing from a group's answer falls back to its own request.
+
+        Args:
+            players: (player_name, player_data) pairs
+
+        Returns:
+            Analysis per player name
+        """
+        analyses = {}
+        pending = []
+        for name, data in players:
+            if not self._validate_player_data(data):
+                analyses[name] = self._generate_fallback_analysis(name)
+            elif await self.is_analysis_cached(name, data):
+                analyses[name] = await self._analyze_player_performance(name, data)
+            else:
+                pending.append((name, data))
+
+        groups = [
+            pending[start:start + _MULTI_ANALYSIS_SIZE]
+            for start in range(0, len(pending), _MULTI_ANALYSIS_SIZE)
+        ]
+        for group_analyses in await asyncio.gather(*(self._analyze_group(g) for g in groups)):
+            analyses.update(group_analyses)
+
+        missing = [(name, data) for name, data in pending if name not in analyses]
+        if missing:
+            logger.warning(f"{len(missing)} players missing from combined analyses, retrying singly")
+            for (name, _), analysis in zip(missing, await self.analyze_many(missing)):
+                analyses[name] = analysis
+        return analyses
+
+    async def _analyze_group(self, group: List[Tuple[str, Dict[str, Any]]]) -> Dict[str, str]:
+        """One JSON-mode completion for a group of players; {} if the answer is unusable"""
+        names = {name.title(): name for name, _ in group}
+        prompt = _MULTI_ANALYSIS_TEMPLATE.format_map({
+            "date": _current_month(),
+            "players": "\n".join(
+                _MULTI_ANALYSIS_PLAYER_BLOCK.format(
+                    name=name.title(),
+                    position=_clip(data.get('player_info', {}).get('position', 'N/A')),
+                    team=_clip(data.get('player_info', {}).get('team', 'N/A')),
+                    age=_clip(data.get('player_info', {}).get('age', 'N/A')),
+                    season=_clip(data.get('season_stats', 'Stats unavailable')),
+                    recent=_clip(data.get('recent_games', 'No recent data')),
+                    context=_clip(data.get('context', 'No additional context')),
+                    advanced=_clip(data.get('advanced', 'No advanced metrics')),
+                )
+                for name, data in group
+            ),
+        })
+        content = await self._get_ai_response(
+            prompt,
+            max_tokens=_MULTI_ANALYSIS_TOKENS_PER_PLAYER * len(group),
+            system=_MULTI_ANALYSIS_SYSTEM_PROMPT,
+            response_format={"type": "json_object"},
+            fallback="",
+        )
+        try:
+            answers = json.loads(content).get("analyses") or {}
+        except (ValueError, AttributeError):
+            logger.warning("Combined analysis was not a JSON object")
+            return {}
+
+        return {
+            names[title]: text.strip()
+            for title, text in answers.items()
+            if title in names and isinstance(text, str) and text.strip()
+        }
+
+    def analyze_many_sync(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """Blocking analyze_many for scripts and other code without an event loop"""
+        async def run() -> List[str]:
+            try:
+                return await self.analyze_many(items)
+            finally:
+                # The loop ends with this call; don't leave its connections open
+                await _close_client()
+
+        return asyncio.run(run())
+
+    async def is_analysis_cached(self, player_name: str, player_data: Dict[str, Any]) -> bool:
+        """Whether _analyze_player_performance would be answered from the response cache"""
+        if not self._validate_player_data(player_data):
+            return False
+        if "comparison_data" not in player_data and await _get_precomputed_analysis(player_name):
+            return True
+        prompt = self._create_analysis_prompt(player_name, player_data)
+        model, max_tokens = self._completion_params(player_data)
+        key = _response_cache_key(
+            prompt, model, self.temperature, max_tokens, self._system_prompt(player_data)
+        )
+        return await _get_cached_response(key) is not None
+
+    async def _stream_player_analysis(
+        self, player_name: str, player_data: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of _analyze_player_performance
+
+        Yields the analysis as it is generated so the first words reach the client
+        at the model's first-token latency rather than after the full completion.
+        """
+        if not self._validate_player_data(player_data):
+            yield self._generate_fallback_analysis(player_name)
+            return
+
+        precomputed = await _get_precomputed_analysis(player_name)
+        if precomputed is not None:
+            yield precomputed
+            return
+
+        prompt = self._create_analysis_prompt(player_name, player_data)
+        async for chunk in self._stream_ai_response(prompt, self._system_prompt(player_data)):
+            yield chunk
+
+    async def _stream_ai_response(self, prompt: str, system: str = "") -> AsyncIterator[str]:
+        """
+        Stream a completion chunk by chunk
+
+        Cache hits are yielded whole. A complete streamed answer is stored in the
+        same cache _get_ai_response uses; there are no retries once tokens have
+        started flowing.
+        """
+        cache_key = _response_cache_key(prompt, self.model, self.temperature, self.max_tokens, system)
+        cached = await _get_cached_response(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
+
+        parts = []
+        try:
+            async with self._request_slot(prompt, self.max_tokens):
+                stream = await _get_client().chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        parts.append(content)
+                        yield content
+        except openai.AuthenticationError:
+            logger.error("OpenAI authentication failed")
+            yield "Analysis service authentication error - please check API configuration"
+            return
+        except Exception as e:
+            logger.error(f"Error streaming AI response: {e}")
+            if not parts:
+                yield "Analysis service error - please try again later"
+            return
+
+        content = "".join(parts).strip()
+        if len(content) > 50:
+            await _store_cached_response(cache_key, content)
 
     def _validate_player_data(self, player_data: Dict[str, Any]) -> bool:
         if not isinstance(player_data, dict):
@@ -68,98 +752,267 @@ class BaseballAnalyzer:
         if "comparison_data" in player_data:
             return self._create_comparison_prompt(player_data["comparison_data"])
 
-        current_date = datetime.now().strftime("%B %Y")
+        player_info = player_data.get('player_info', {})
 
-        prompt = f"""
-        You are a professional baseball analyst with expertise in modern analytics and player evaluation. Analyze this player's current performance:
+        return _ANALYSIS_TEMPLATE.format_map({
+            "player_name": player_name.title(),
+            "date": _current_month(),
+            "recent_games": _clip(player_data.get('recent_games', 'No recent data available')),
+            "season_stats": _clip(player_data.get('season_stats', 'Season stats unavailable')),
+            "context": _clip(player_data.get('context', 'No additional context')),
+            "advanced": _clip(player_data.get('advanced', 'Advanced metrics unavailable')),
+            "position": _clip(player_info.get('position', 'N/A')),
+            "team": _clip(player_info.get('team', 'N/A')),
+            "age": _clip(player_info.get('age', 'N/A')),
+        })
 
-        Player: {player_name.title()}
-        Date: {current_date}
-
-        PERFORMANCE DATA:
-        Recent Games: {player_data.get('recent_games', 'No recent data available')}
-        Season Stats: {player_data.get('season_stats', 'Season stats unavailable')}
-        Context: {player_data.get('context', 'No additional context')}
-        Advanced Metrics: {player_data.get('advanced', 'Advanced metrics unavailable')}
+    def _system_prompt(self, player_data: Dict[str, Any]) -> str:
+        """Static instructions sent ahead of _create_analysis_prompt's user message"""
+        if "comparison_data" in player_data:
+            return _COMPARISON_SYSTEM_PROMPT
+        return _ANALYSIS_SYSTEM_PROMPT
 
-        PLAYER INFO:
-        Position: {player_data.get('player_info', {}).get('position', 'N/A')}
-        Team: {player_data.get('player_info', {}).get('team', 'N/A')}
-        Age: {player_data.get('player_info', {}).get('age', 'N/A')}
+    def _completion_params(self, player_data: Dict[str, Any]) -> Tuple[str, int]:
+        """Model and max_tokens for an analysis: comparisons use the stronger model"""
+        if "comparison_data" in player_data:
+            return self.comparison_model, self.comparison_max_tokens
+        return self.model, self.max_tokens
 
-        ANALYSIS REQUIREMENTS:
-        Provide a comprehensive analysis covering:
+    def _create_comparison_prompt(self, comparison_data: str) -> str:
+        """Create prompt for player comparison analysis"""
+        return _COMPARISON_TEMPLATE.format_map(
+            {"comparison_data": _clip(comparison_data, _COMPARISON_DATA_CHARS)}
+        )
 
-        1. **Current Form Assessment**: Evaluate recent performance trends and hot/cold streaks
-        2. **Season Performance**: How they're performing relative to expectations and career norms
-        3. **Strengths & Concerns**: Key positive trends and areas of worry
-        4. **Fantasy/Betting Insights**: Actionable insights for fantasy players and sports bettors
-        5. **Key Takeaway**: One-sentence bottom line assessment
+    def format_comparison_data(self, players: List[Tuple[str, Dict[str, Any]]]) -> str:
+        """
+        Render the per-player stat blocks for a comparison prompt
 
-        IMPORTANT GUIDELINES:
-        - Use specific statistical context when available
-        - Compare to league averages where relevant (league avg batting ~.248, ERA ~4.00)
-        - Consider position and age context
-        - Be engaging but analytically rigorous
-        - Keep total response under 300 words
-        - Focus on actionable insights
+        Args:
+            players: (name, player_data) pairs in the order they should be compared
+        """
+        return "\n".join(
+            _COMPARISON_PLAYER_BLOCK.format(
+                number=number,
+                name=name.title(),
+                season=_clip(data.get('season_stats', 'Stats unavailable')),
+                recent=_clip(data.get('recent_games', 'No recent data')),
+                advanced=_clip(data.get('advanced', 'No advanced metrics')),
+            )
+            for number, (name, data) in enumerate(players, start=1)
+        )
 
-        Provide your analysis now:
+    async def _get_ai_response(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        system: Optional[str] = None,
+        response_format: Optional[Dict[str, str]] = None,
+        max_retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+        min_length: int = 50,
+        fallback: Optional[str] = None,
+        check_cache: bool = True,
+    ) -> str:
         """
-        return prompt
+        Get AI response with error handling and retries
 
-    def _create_comparison_prompt(self, comparison_data: str) -> str:
-        """Create prompt for player comparison analysis"""
-        return f"""
-                You are a professional baseball analyst. Provide a detailed comparison analysis:
+        Args:
+            prompt: User message to send
+            model/max_tokens/temperature: Overrides for the analyzer defaults
+            system: Optional system message sent before the prompt
+            response_format: Passed through, e.g. {"type": "json_object"} for JSON mode
+            max_retries: Retries after the first attempt (default self.max_retries)
+            timeout: Per-attempt request timeout in seconds (default: the client's)
+            min_length: Shorter completions are treated as failed attempts
+            fallback: Returned instead of the service error messages when no
+                usable completion could be produced
+            check_cache: False when the caller has already looked the prompt up;
+                a completion is still stored either way
+        """
+        model = model or self.model
+        max_tokens = max_tokens or self.max_tokens
+        temperature = self.temperature if temperature is None else temperature
+        max_retries = self.max_retries if max_retries is None else max_retries
 
-                {comparison_data}
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
 
-                COMPARISON ANALYSIS REQUIREMENTS:
-                1. **Head-to-Head Stats**: Direct statistical comparison
-                2. **Strengths of Each Player**: What each player does better
-                3. **Current Form**: Who's performing better recently
-                4. **Context Considerations**: Age, team, position factors
-                5. **Bottom Line**: Which player you'd prefer and why
+        extra = {}
+        if response_format:
+            extra["response_format"] = response_format
+        if timeout is not None:
+            extra["timeout"] = timeout
 
-                Keep analysis under 250 words and focus on practical insights for fantasy and betting decisions.
-                """
+        cache_key = _response_cache_key(prompt, model, temperature, max_tokens, system or "")
+        if check_cache:
+            cached = await _get_cached_response(cache_key)
+            if cached is not None:
+                return cached
 
-    def _get_ai_response(self, prompt: str) -> str:
-        """Get AI response with error handling and retries"""
-        for attempt in range(self.max_retries + 1):
+        for attempt in range(max_retries + 1):
             try:
-                response = openai.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens,
-                )
+                async with self._request_slot(prompt, max_tokens):
+                    response = await _get_client().chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        max_tokens=max_tokens,
+                        **extra,
+                    )
 
                 content = response.choices[0].message.content.strip()
 
-                if content and len(content) > 50:
+                if content and len(content) >= min_length:
+                    await _store_cached_response(cache_key, content)
                     return content
                 else:
                     logger.warning(f"Short AI response received (attempt {attempt + 1})")
 
             except openai.AuthenticationError:
                 logger.error("OpenAI authentication failed")
+                if fallback is not None:
+                    return fallback
                 return "Analysis service authentication error - please check API configuration"
 
-            except openai.RateLimitError:
+            except openai.RateLimitError as e:
                 logger.warning(f"Rate limit hit (attempt {attempt + 1})")
-                if attempt == self.max_retries:
+                if attempt == max_retries:
+                    if fallback is not None:
+                        return fallback
                     return "Analysis service temporarily busy - please try again in a moment"
+                await asyncio.sleep(_backoff_delay(attempt, e))
+
+            except openai.APIConnectionError as e:
+                # Also covers APITimeoutError
+                logger.warning(f"OpenAI connection problem (attempt {attempt + 1}): {e}")
+                if attempt == max_retries:
+                    if fallback is not None:
+                        return fallback
+                    return "Analysis service temporarily unavailable - please try again in a moment"
+                await asyncio.sleep(_backoff_delay(attempt))
                     
             except Exception as e:
                 logger.error(f"Unexpected error in AI response (attempt {attempt + 1}): {e}")
-                if attempt == self.max_retries:
+                if attempt == max_retries:
+                    if fallback is not None:
+                        return fallback
                     return "Analysis service error - please try again later"
+                await asyncio.sleep(_backoff_delay(attempt))
         
+        if fallback is not None:
+            return fallback
         return "Unable to generate analysis after multiple attempts"
 
-    def _extract_player_names(self, question: str, data_service) -> list:
+    async def batch_analyze(self, players: List[str]) -> Optional[str]:
+        """
+        Queue analyses for many players through the OpenAI Batch API
+
+        Batch requests cost half as much and use a separate rate-limit pool, but may
+        take up to 24h, so this is for precomputing (e.g. nightly starter cards).
+        Results land in the response cache via collect_batch, keyed by player and
+        submit day, where the realtime analysis paths pick them up.
+
+        Args:
+            players: Player names to analyze
+
+        Returns:
+            The batch id, or None if no player had usable data
+        """
+        results = await asyncio.gather(
+            *(self.data_service.get_player_data_async(name) for name in players),
+            return_exceptions=True,
+        )
+
+        submit_day = datetime.now(timezone.utc).date()
+        prompts = {}
+        for player_name, player_data in zip(players, results):
+            if isinstance(player_data, Exception) or not self._validate_player_data(player_data):
+                logger.warning(f"Skipping {player_name} in batch: no usable data")
+                continue
+            prompt = self._create_analysis_prompt(player_name, player_data)
+            prompts[_precomputed_key(player_name, submit_day)] = prompt
+
+        if not prompts:
+            return None
+        return await self._submit_batch(prompts)
+
+    async def _submit_batch(self, prompts: Dict[str, str]) -> str:
+        """Upload one chat completion request per prompt (keyed by custom_id) and start a batch"""
+        lines = []
+        for custom_id, prompt in prompts.items():
+            request = {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": _ANALYSIS_SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt},
+                    ],
+                    "temperature": self.temperature,
+                    "max_tokens": self.max_tokens,
+                },
+            }
+            lines.append(json.dumps(request))
+
+        client = _get_client()
+        batch_file = await client.files.create(
+            file=("analyses.jsonl", "\n".join(lines).encode()), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted analysis batch {batch.id} with {len(lines)} requests")
+        return batch.id
+
+    async def collect_batch(self, batch_id: str) -> Optional[int]:
+        """
+        Store a finished batch's analyses in the response cache
+
+        Returns:
+            Number of analyses cached, or None while the batch is still running
+        """
+        client = _get_client()
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status not in _BATCH_TERMINAL_STATES:
+            return None
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"Analysis batch {batch_id} finished with status {batch.status}")
+            return 0
+
+        output = await client.files.content(batch.output_file_id)
+        stored = 0
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            response = result.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            content = response["body"]["choices"][0]["message"]["content"].strip()
+            if content and len(content) > 50:
+                await _store_cached_response(result["custom_id"], content, _BATCH_WINDOW_SECONDS)
+                stored += 1
+        logger.info(f"Cached {stored} analyses from batch {batch_id}")
+        return stored
+
+    async def wait_for_batch(self, batch_id: str, poll_interval: float = 60.0) -> int:
+        """Poll a batch until it finishes, then cache its results"""
+        while True:
+            stored = await self.collect_batch(batch_id)
+            if stored is not None:
+                return stored
+            await asyncio.sleep(poll_interval)
+
+    async def _extract_player_names(self, question: str, data_service) -> list:
         """
         Extract and validate player names from the question using MLB search API
         
@@ -170,63 +1023,26 @@ class BaseballAnalyzer:
         Returns:
             List of confirmed player names
         """
-        import re
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        logger.debug("Extracting names from question: %r", question)
         
-        logger.warning(f"DEBUG: Extracting names from question: '{question}'")
-        
-        # Method 1: Try to find obvious name patterns (capitalized words)
-        name_matches = re.findall(r'[A-Z][a-z]+ [A-Z][a-z]+(?:\s+[A-Z][a-z]+)*', question)
-        potential_names = [name.strip() for name in name_matches]
-        logger.warning(f"DEBUG: Method 1 (capitalized) found: {potential_names}")
-        
-        # Method 2: For lowercase questions, check adjacent word pairs
-        # First, clean punctuation from words
-        import string
-        words = [word.strip(string.punctuation) for word in question.split()]
-        logger.warning(f"DEBUG: Split words (cleaned): {words}")
-        
-        for i in range(len(words) - 1):
-            # Skip empty words after punctuation removal
-            if not words[i] or not words[i+1]:
-                continue
-                
-            # Check two-word combinations
-            name_candidate = f"{words[i]} {words[i+1]}".title()
-            if name_candidate not in potential_names:
-                potential_names.append(name_candidate)
-            
-            # Check three-word combinations (for names like "Vladimir Guerrero Jr")
-            if i < len(words) - 2 and words[i+2]:
-                three_word_name = f"{words[i]} {words[i+1]} {words[i+2]}".title()
-                if three_word_name not in potential_names:
-                    potential_names.append(three_word_name)
-        
-        logger.warning(f"DEBUG: All potential names: {potential_names}")
+        # Clean punctuation and possessives ("Trout's") from words
+        words = [_clean_word(word) for word in question.split()]
+        logger.debug("Split words (cleaned): %s", words)
+
+        potential_names = _candidate_names(words, data_service.first_name_tokens())
         
-        # Validate each potential name with MLB search API
-        confirmed_players = []
+        logger.debug("All potential names: %s", potential_names)
         
-        # Expanded stop words - common phrases that are definitely not player names
-        stop_phrases = [
-            # Baseball terms
-            'home runs', 'batting average', 'runs batted', 'earned run', 'run average',
-            # Question words
-            'how many', 'what is', 'who has', 'can you', 'do you', 'will you',
-            # Common verbs + pronouns  
-            'you do', 'do you', 'you can', 'can you', 'you analyze', 'analyze you',
-            'do connor', 'can trevor', 'you trevor', 'analyze trevor', 'trevor analyze',
-            # Common sentence starters
-            'now can', 'can now', 'now you', 'you now', 'then can', 'can then',
-            # Single common words (when they appear in 2-word combos with names)
-            'the', 'and', 'but', 'for', 'with', 'about', 'now', 'then', 'can', 'you', 'do', 'will', 'would', 'please', 'thank you', 'thank'
-        ]
+        candidates = []
         
         for name in potential_names:
             name_lower = name.lower()
             
             # Skip exact matches from stop phrases
-            if name_lower in stop_phrases:
-                logger.warning(f"DEBUG: Skipping exact stop phrase: '{name}'")
+            if name_lower in _STOP_PHRASES:
+                if debug_enabled:
+                    logger.debug("Skipping exact stop phrase: %r", name)
                 continue
             
             # Skip patterns: common_verb + potential_name  
@@ -234,27 +1050,55 @@ class BaseballAnalyzer:
             if len(words_in_name) == 2:
                 first_word = words_in_name[0]
                 # Skip if starts with common command words
-                if first_word in ['do', 'can', 'will', 'would', 'please', 'now', 'then', 'you']:
-                    logger.warning(f"DEBUG: Skipping command pattern: '{name}'")
+                if first_word in _COMMAND_WORDS:
+                    if debug_enabled:
+                        logger.debug("Skipping command pattern: %r", name)
                     continue
-                
-            logger.warning(f"DEBUG: Searching MLB API for: '{name}'")
-            try:
-                search_results = data_service.search_players(name)
-                logger.warning(f"DEBUG: MLB API returned {len(search_results) if search_results else 0} results for '{name}'")
-                if search_results:  # If MLB API finds results, it's a real player
-                    confirmed_players.append(name)
-                    logger.warning(f"DEBUG: Confirmed player: '{name}'")
-                    if len(confirmed_players) >= 2:  # Limit to 2 players max
-                        break
-            except Exception as e:
-                logger.warning(f"Error searching for player '{name}': {e}")
+
+            candidates.append(name)
+
+        confirmed_players = []
+
+        # With the active-player index loaded, names are matched locally in one scan
+        # of the question; only plausible partial matches still go to the MLB search API
+        if data_service.has_player_index():
+            confirmed_players = data_service.find_player_names(question)[:2]
+            if len(confirmed_players) >= 2:
+                return confirmed_players
+            # Windows inside a name the index already matched ("Guerrero Jr" from
+            # "Vladimir Guerrero Jr.") would confirm the same player a second time
+            matched_words = [set(_fold_name(name).split()) for name in confirmed_players]
+            candidates = [
+                name for name in candidates
+                if not data_service.is_active_player_name(name)
+                and data_service.could_be_player_name(name)
+                and not any(set(_fold_name(name).split()) <= words for words in matched_words)
+            ]
+
+        # Validate remaining candidates with the MLB search API concurrently
+        logger.debug("Searching MLB API for: %s", candidates)
+        results = await asyncio.gather(
+            *(_run_blocking(data_service.search_players, name) for name in candidates),
+            return_exceptions=True,
+        )
+
+        for name, search_results in zip(candidates, results):
+            if isinstance(search_results, Exception):
+                logger.warning(f"Error searching for player '{name}': {search_results}")
                 continue
+            if debug_enabled:
+                logger.debug("MLB API returned %d results for %r", len(search_results or ()), name)
+            if search_results:  # If MLB API finds results, it's a real player
+                confirmed_players.append(name)
+                if debug_enabled:
+                    logger.debug("Confirmed player: %r", name)
+                if len(confirmed_players) >= 2:  # Limit to 2 players max
+                    break
         
-        logger.warning(f"DEBUG: Final confirmed players: {confirmed_players}")
+        logger.debug("Final confirmed players: %s", confirmed_players)
         return confirmed_players
 
-    def _answer_baseball_question(self, question: str) -> str:
+    async def _answer_baseball_question(self, question: str) -> str:
         """
         Answer natural language questions about baseball players by:
         1. Parsing the question to extract player names and requested stats
@@ -262,71 +1106,125 @@ class BaseballAnalyzer:
         3. Providing a direct answer
         """
         try:
-            # Import here to avoid circular imports
-            from src.services.data_service import MLBDataService
-            import re
-            
-            data_service = MLBDataService()
+            data_service = self.data_service
             
             # Extract player names using our new dynamic method
-            found_players = self._extract_player_names(question, data_service)
+            found_players = await self._extract_player_names(question, data_service)
             
             if not found_players:
                 return "I couldn't identify any player names in your question. Please mention a specific player name (e.g., 'aaron judge', 'Mike Trout', 'shohei ohtani')."
             
-            # Fetch data for the identified players
+            # Fetch data for the identified players concurrently
+            results = await asyncio.gather(
+                *(data_service.get_player_data_async(name) for name in found_players),
+                return_exceptions=True,
+            )
             player_data = {}
-            for player_name in found_players:
-                data = data_service.get_player_data(player_name)
-                if data:
+            for player_name, data in zip(found_players, results):
+                if isinstance(data, Exception):
+                    logger.warning(f"Error fetching data for '{player_name}': {data}")
+                elif data:
                     player_data[player_name] = data
             
             if not player_data:
                 return f"I couldn't find current data for: {', '.join(found_players)}. They might not be active players or the name might need adjustment."
             
-            # Provide direct answers with extracted stats
-            question_lower = question.lower()
-            
             if len(player_data) == 1:
-                player_name = list(player_data.keys())[0]
-                data = player_data[player_name]
-                season_stats = data.get('season_stats', 'N/A')
-                
-                # Extract specific stats based on question keywords
-                if any(keyword in question_lower for keyword in ['hr', 'home run', 'homer']):
-                    # Extract HR count from season stats
-                    import re
-                    hr_match = re.search(r'(\d+) HR', season_stats)
-                    if hr_match:
-                        hr_count = hr_match.group(1)
-                        return f"{player_name} has {hr_count} home runs this season (2025). Full stats: {season_stats}"
-                
-                elif any(keyword in question_lower for keyword in ['avg', 'average', 'batting']):
-                    avg_match = re.search(r'(\.\d+) avg', season_stats)
-                    if avg_match:
-                        avg = avg_match.group(1)
-                        return f"{player_name} is batting {avg} this season. Full stats: {season_stats}"
-                
-                elif any(keyword in question_lower for keyword in ['rbi', 'runs batted in', 'runs batted']):
-                    rbi_match = re.search(r'(\d+) RBI', season_stats)
-                    if rbi_match:
-                        rbi = rbi_match.group(1)
-                        return f"{player_name} has {rbi} RBIs this season. Full stats: {season_stats}"
-                
-                # Default response with all stats
-                return f"Here are {player_name}'s current stats: {season_stats}. Recent performance: {data.get('recent_games', 'N/A')}"
-            
-            else:
-                # Multiple players - provide comparison
-                result = "Here are the stats for the players mentioned:\n\n"
-                for player_name, data in player_data.items():
-                    result += f"{player_name}: {data.get('season_stats', 'N/A')}\n"
-                return result
+                player_name, data = next(iter(player_data.items()))
+                if self._direct_stat_answer(question, player_name, data) is None:
+                    answer = await self._answer_with_model(question, player_name, data)
+                    if answer:
+                        return answer
+            return self._format_stats_answer(question, player_data)
             
         except Exception as e:
             logger.error(f"Error answering question: {e}")
             return f"I encountered an error trying to answer your question: {str(e)}"
 
+    async def _answer_with_model(self, question: str, player_name: str, data: Dict) -> str:
+        """
+        _ask_stat_question behind the semantic cache
+
+        Only questions that actually need the model pay for an embedding; answers
+        are reused for the same player until that player's recent stats go stale.
+        """
+        embedding = await self._embed_question(question)
+        if embedding is not None:
+            cached = await _run_blocking(_semantic_cache.lookup, embedding, [player_name])
+            if cached is not None:
+                return cached
+
+        answer = await self._ask_stat_question(question, player_name, data)
+        if answer and embedding is not None:
+            ttl = self.data_service.recent_ttl.total_seconds()
+            _semantic_cache.store(embedding, [player_name], answer, ttl)
+        return answer
+
+    async def _embed_question(self, question: str) -> Optional[List[float]]:
+        """Embed the question for semantic cache lookups; None if embeddings are unavailable"""
+        try:
+            response = await _get_client().embeddings.create(
+                model=self.embedding_model, input=question
+            )
+            return response.data[0].embedding
+        except Exception as e:
+            logger.warning(f"Question embedding failed, skipping semantic cache: {e}")
+            return None
+
+    async def _ask_stat_question(self, question: str, player_name: str, data: Dict) -> str:
+        """Answer a question we have no direct stat template for with the cheap QA model"""
+        prompt = (
+            f"Question: {question}\n"
+            f"Player: {player_name}\n"
+            f"Season: {data.get('season_stats', 'N/A')}\n"
+            f"Recent: {data.get('recent_games', 'N/A')}\n"
+            f"Advanced: {data.get('advanced', 'N/A')}"
+        )
+        return await self._get_ai_response(
+            prompt,
+            model=self.qa_model,
+            max_tokens=self.qa_max_tokens,
+            temperature=self.qa_temperature,
+            system=_QA_SYSTEM_PROMPT,
+            max_retries=self.qa_max_retries,
+            timeout=self.qa_timeout,
+            min_length=1,
+            fallback="",
+        )
+
+    def _direct_stat_answer(self, question: str, player_name: str, data: Dict) -> Optional[str]:
+        """Answer the specific stat the question asks about, if we have it"""
+        stat = _classify_stat_intent(question.lower())
+        if not stat:
+            return None
+        season_stats = data.get('season_stats', 'N/A')
+        stats = data.get('season_totals') or _parse_season_stats(season_stats)
+        value = stats.get(stat)
+        if value is None:
+            return None
+        return _STAT_ANSWERS[stat].format(player=player_name, value=value, stats=season_stats)
+
+    def _format_stats_answer(self, question: str, player_data: Dict[str, Dict]) -> str:
+        """Build a direct answer from the fetched player data"""
+        if len(player_data) == 1:
+            player_name = list(player_data.keys())[0]
+            data = player_data[player_name]
+            season_stats = data.get('season_stats', 'N/A')
+
+            direct_answer = self._direct_stat_answer(question, player_name, data)
+            if direct_answer:
+                return direct_answer
+            
+            # Default response with all stats
+            return f"Here are {player_name}'s current stats: {season_stats}. Recent performance: {data.get('recent_games', 'N/A')}"
+        
+        else:
+            # Multiple players - provide comparison
+            result = "Here are the stats for the players mentioned:\n\n"
+            for player_name, data in player_data.items():
+                result += f"{player_name}: {data.get('season_stats', 'N/A')}\n"
+            return result
+
     def _generate_fallback_analysis(self, player_name: str) -> str:
         """Generate fallback analysis when data is insufficient"""
         return f"Unable to provide detailed analysis for {player_name} due to insufficient data. Please try again later."
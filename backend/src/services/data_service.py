@@ -1,110 +1,517 @@
 import statsapi
+import asyncio
+import bisect
+import diskcache
+import functools
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+import orjson
+import os
+import requests
+import string
+import tempfile
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, wait
+from rapidfuzz import fuzz, process, utils
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import date, datetime, timedelta
+from collections import Counter
+from typing import Dict, FrozenSet, Optional, List, Tuple
 import re
 
+from src.utils import now_str
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# On-disk so cached players survive restarts and are shared by all uvicorn workers
+DEFAULT_CACHE_DIR = os.getenv(
+    "LINEDRIVE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "linedrive_cache")
+)
+
+
+_NAME_PUNCTUATION = str.maketrans("", "", ".,'")
+_NAME_SUFFIX_RE = re.compile(r"\b(?:jr|sr|ii|iii|iv)\b")
+_SENTENCE_ENDINGS = (".", "!", "?")
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+# The stats API sends rates like ERA as strings, with "-.--" when undefined
+_NUMBER_RE = re.compile(r"-?\d*\.?\d+")
+
+
+def _fold_name(name: str) -> str:
+    """Casefold a name and strip accents, punctuation and suffixes so "Acuña Jr." matches "acuna" """
+    # Plain ASCII names (most of the roster) have nothing to decompose
+    if not name.isascii():
+        decomposed = unicodedata.normalize("NFKD", name)
+        name = "".join(c for c in decomposed if not unicodedata.combining(c))
+    folded = name.casefold().translate(_NAME_PUNCTUATION)
+    return " ".join(_NAME_SUFFIX_RE.sub("", folded).split())
+
+
+def _player_cache_key(player_name: str) -> str:
+    """Cache key shared by every spelling of a name ("Acuña Jr." and "acuna jr")"""
+    return f"player_{_fold_name(player_name)}"
+
+
+def _as_number(value) -> float:
+    """Numeric stat value, or 0 when the API sent a placeholder"""
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str) and _NUMBER_RE.fullmatch(value):
+        return float(value)
+    return 0
+
+
+def _clean_word(word: str) -> str:
+    word = word.strip(string.punctuation)
+    if word.lower().endswith("'s"):
+        word = word[:-2]
+    return word
+
+
+class _ActivePlayerIndex:
+    """Snapshot of the active MLB player list, used to validate names without an API call"""
 
-class MLBDataService:
     def __init__(self):
-        self.cache = {}
-        self.cache_duration = timedelta(minutes=30)
+        self.players: List[Dict] = []
+        # folded full name -> display name, and unambiguous folded last name -> display name
+        self.names: Dict[str, str] = {}
+        self.last_names: Dict[str, str] = {}
+        self.max_name_words = 0
+        # folded full name -> player id; choices holds the same names already run
+        # through rapidfuzz's default_process, in the same order, for fuzzy matching
+        self.ids: Dict[str, int] = {}
+        self.choice_ids: List[int] = []
+        self.choices: List[str] = []
+        # player id -> primary position abbreviation ("P", "RF", "TWP", ...)
+        self.positions: Dict[int, str] = {}
+        self.tokens: FrozenSet[str] = frozenset()
+        self.first_names: FrozenSet[str] = frozenset()
+        self.loaded_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> int:
+        season = statsapi.latest_season().get("seasonId", datetime.now().year)
+        response = statsapi.get(
+            "sports_players",
+            {
+                "sportId": 1,
+                "season": season,
+                "fields": "people,id,fullName,currentTeam,id,primaryPosition,abbreviation",
+            },
+        )
+        players = response.get("people", [])
+        names = {_fold_name(p["fullName"]): p["fullName"] for p in players if p.get("fullName")}
+        ids = {_fold_name(p["fullName"]): p["id"] for p in players if p.get("fullName")}
+        last_name_counts = Counter(name.split()[-1] for name in names)
+        last_names = {
+            name.split()[-1]: full_name
+            for name, full_name in names.items()
+            if last_name_counts[name.split()[-1]] == 1
+        }
+        tokens = frozenset(token for name in names for token in name.split())
+        first_names = frozenset(name.split()[0] for name in names)
+
+        with self._lock:
+            self.players = players
+            self.names = names
+            self.last_names = last_names
+            self.max_name_words = max((len(name.split()) for name in names), default=0)
+            self.ids = ids
+            self.choice_ids = list(ids.values())
+            self.choices = [utils.default_process(name) for name in ids]
+            self.positions = {
+                p["id"]: p.get("primaryPosition", {}).get("abbreviation", "") for p in players
+            }
+            self.tokens = tokens
+            self.first_names = first_names
+            self.loaded_at = datetime.now()
+        return len(players)
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(self.names)
+
+    def match_id(self, name: str, score_cutoff: float = 85) -> Optional[int]:
+        """Id of the active player best matching the name, tolerating typos and word order"""
+        ids, choice_ids, choices = self.ids, self.choice_ids, self.choices
+        folded = _fold_name(name)
+        if folded in ids:
+            return ids[folded]
+        # choices are preprocessed once at refresh, so only the query is processed here
+        match = process.extractOne(
+            utils.default_process(folded),
+            choices,
+            scorer=fuzz.WRatio,
+            processor=None,
+            score_cutoff=score_cutoff,
+        )
+        return choice_ids[match[2]] if match else None
+
+    def find_names(self, text: str) -> List[str]:
+        """
+        Active players mentioned in free text, in order of appearance
+
+        One left-to-right scan trying the longest full-name window first at each
+        word, so it costs O(words) dict lookups and no API calls. A single
+        capitalized word also matches when it is a unique last name ("Judge"),
+        unless it opens a sentence in text that names another player in full.
+        """
+        # Suffix words fold to "" and are dropped so "Acuña Jr." scans like "Acuña".
+        # Each kept word also records whether it opens a sentence.
+        raw_words: List[str] = []
+        words: List[str] = []
+        sentence_starts: List[bool] = []
+        sentence_start = True
+        for token in text.split():
+            raw = _clean_word(token)
+            folded = _fold_name(raw)
+            if not folded:
+                continue
+            raw_words.append(raw)
+            words.append(folded)
+            sentence_starts.append(sentence_start)
+            sentence_start = token.endswith(_SENTENCE_ENDINGS)
+
+        # (display name, words matched, matched word opens a sentence)
+        matches: List[Tuple[str, int, bool]] = []
+        i = 0
+        while i < len(words):
+            match_size = 0
+            for size in range(min(self.max_name_words, len(words) - i), 0, -1):
+                if size > 1:
+                    full_name = self.names.get(" ".join(words[i:i + size]))
+                elif raw_words[i][:1].isupper():
+                    full_name = self.last_names.get(words[i])
+                else:
+                    full_name = None
+                if full_name:
+                    matches.append((full_name, size, sentence_starts[i]))
+                    match_size = size
+                    break
+            i += match_size or 1
+
+        # A capitalized first word ("May I ask...", "Story time") is only taken as a
+        # last name when the text names no player in full
+        has_full_name = any(size > 1 for _, size, _ in matches)
+        found: List[str] = []
+        for full_name, size, opens_sentence in matches:
+            if size == 1 and opens_sentence and has_full_name:
+                continue
+            if full_name not in found:
+                found.append(full_name)
+        return found
+
+
+_player_index = _ActivePlayerIndex()
+
+# Schedule statuses after which a game's boxscore can no longer change
+_FINAL_GAME_STATUSES = frozenset({"Final", "Game Over", "Completed Early"})
+# Batting-average bands for the player context line (MLB average is about .240);
+# an average has to be above a threshold to reach the next label
+_AVG_THRESHOLDS = (0.210, 0.240, 0.270, 0.300)
+_AVG_CONTEXTS = (
+    "Struggling at the plate this season",
+    "Hitting mid-range this season",
+    "Hitting OK this season",
+    "Hitting well this season",
+    "Excellent batting average this season",
+)
+# Schedule states in which a game can't (yet, or any more) change a player's stats
+_PREGAME_STATUSES = frozenset({"Scheduled", "Pre-Game", "Warmup"})
+_NO_PLAY_STATUSES = frozenset({"Postponed", "Cancelled", "Suspended"})
+
+
+def _game_status(game: Dict) -> str:
+    """A schedule entry's status without its detail ("Final: Tied" -> "Final")"""
+    return (game.get("status") or "").split(":", 1)[0]
+
+
+def _orjson_body(response: requests.Response, *args, **kwargs) -> requests.Response:
+    """Response hook: make response.json() (what statsapi calls) decode with orjson"""
+    response.json = lambda **_: orjson.loads(response.content)
+    return response
+
+
+def _build_session() -> requests.Session:
+    """Keep-alive session for every MLB API request, with retries on 5xx responses"""
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+    session.mount("https://", HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=retries))
+    session.hooks["response"].append(_orjson_body)
+    return session
+
+
+_http = _build_session()
+# statsapi calls the module-level requests.get for every request, opening a new
+# connection each time; route it through the shared session so TLS is reused
+statsapi.requests = _http
+
+_BOXSCORE_URL = "https://statsapi.mlb.com/api/v1/game/{game_id}/boxscore"
+# Server-side projection: only the lineup and the six batting numbers come back,
+# not the pitching, fielding, season stats and info blocks of a full boxscore
+_BOXSCORE_FIELDS = (
+    "teams,away,home,batters,players,battingOrder,stats,batting,"
+    "atBats,hits,homeRuns,rbi,baseOnBalls,strikeOuts"
+)
+_REQUEST_TIMEOUT = 10
+# Projection for the hydrated person request: player identity plus only the stat
+# fields the formatters read, instead of every split's full stat block
+_PERSON_STAT_FIELDS = (
+    "people,id,useName,lastName,active,currentTeam,name,primaryPosition,abbreviation,"
+    "stats,type,group,displayName,splits,season,stat,"
+    "avg,obp,slg,ops,homeRuns,rbi,gamesPlayed,"
+    "wins,losses,era,whip,inningsPitched,strikeOuts,baseOnBalls,hits,earnedRuns,"
+    "gamesStarted,gamesPitched"
+)
+
+
+def _fetch_boxscore_batters(game_id: int) -> Dict[str, List[Dict]]:
+    """
+    Batting lines for both lineups of a game
+
+    Reads the plain boxscore endpoint and decodes it with orjson, instead of
+    statsapi.boxscore_data, which pulls the full live game feed and deep-copies
+    it into display tables this service never uses.
+    """
+    response = _http.get(
+        _BOXSCORE_URL.format(game_id=game_id),
+        params={"fields": _BOXSCORE_FIELDS},
+        timeout=_REQUEST_TIMEOUT,
+    )
+    response.raise_for_status()
+    teams = orjson.loads(response.content)["teams"]
+
+    batters = {}
+    for side in ("away", "home"):
+        players = teams[side].get("players", {})
+        lines = []
+        for person_id in teams[side].get("batters", []):
+            player = players.get(f"ID{person_id}", {})
+            # Same filter as boxscore_data: only players who took a lineup spot
+            if not player.get("battingOrder"):
+                continue
+            batting = player.get("stats", {}).get("batting", {})
+            lines.append({
+                "personId": person_id,
+                "ab": batting.get("atBats", 0),
+                "h": batting.get("hits", 0),
+                "hr": batting.get("homeRuns", 0),
+                "rbi": batting.get("rbi", 0),
+                "bb": batting.get("baseOnBalls", 0),
+                "k": batting.get("strikeOuts", 0),
+            })
+        batters[f"{side}Batters"] = lines
+    return batters
+
+
+def _fetch_person_stats(player_id: int, group: str, stat_type: str) -> Dict:
+    """
+    A player's stat splits, in the shape statsapi.player_stat_data returns
+
+    Same hydrated person request, but with a fields= projection so the API sends
+    (and orjson decodes) only what the formatters use.
+    """
+    response = statsapi.get("person", {
+        "personId": player_id,
+        "hydrate": f"stats(group={group},type={stat_type},sportId=1),currentTeam",
+        "fields": _PERSON_STAT_FIELDS,
+    })
+    person = response["people"][0]
+    team = person.get("currentTeam", {})
+    return {
+        "id": person["id"],
+        "first_name": person.get("useName", ""),
+        "last_name": person.get("lastName", ""),
+        "active": person.get("active"),
+        "current_team": team.get("name", ""),
+        "current_team_id": team.get("id"),
+        "position": person.get("primaryPosition", {}).get("abbreviation", ""),
+        "stats": [
+            {
+                "type": stats["type"]["displayName"],
+                "group": stats["group"]["displayName"],
+                "season": split.get("season"),
+                "stats": split.get("stat", {}),
+            }
+            for stats in person.get("stats", [])
+            for split in stats.get("splits", [])
+        ],
+    }
 
-    def get_player_data(self, player_name: str) -> Optional[Dict]:
-        try:
-            cache_key = f"player_{player_name.lower().strip()}"
-            if self._is_cached_and_fresh(cache_key):
-                return self.cache[cache_key]["data"]
 
-            player_id = self._get_player_id(player_name)
-            if not player_id:
-                logger.warning(f"Player not found: {player_name}")
-                return None
+class _TeamIndex:
+    """Team name -> id for all 30 clubs; ids never change, so it's loaded once on first use"""
 
-            player_data = self._fetch_player_stats(player_id)
-            if not player_data:
-                logger.warning(f"No stats found for {player_name}")
-                return None
+    # A failed load is retried after this long rather than on every lookup
+    retry_after = timedelta(minutes=5)
 
-            formatted_data = self._format_player_data(player_data, player_name)
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self._failed_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Dict[str, int]:
+        with self._lock:
+            if self.ids or (self._failed_at and datetime.now() - self._failed_at < self.retry_after):
+                return self.ids
+            try:
+                self.ids = {team["name"]: team["id"] for team in statsapi.lookup_team("")}
+                self._failed_at = None
+            except Exception as e:
+                logger.error(f"Error loading MLB team list: {e}")
+                self._failed_at = datetime.now()
+            return self.ids
 
-            self.cache[cache_key] = {"data": formatted_data, "timestamp": datetime.now()}
-            return formatted_data
-        except Exception as e:
-            logger.error(f"Error fetching {player_name} data: {e}")
-            return None
 
-    def _get_player_id(self, player_name: str) -> Optional[int]:
-        try:
-            players = statsapi.lookup_player(player_name)
-            if players:
-                return players[0]["id"]
-
-            variations = self._generate_name_variations(player_name)
-            for variation in variations:
-                players = statsapi.lookup_player(variation)
-                if players:
-                    return players[0]["id"]
-            return None
-        except Exception as e:
-            logger.error(f"Error looking up {player_name} data: {e}")
-            return None
+_team_index = _TeamIndex()
 
-    def _generate_name_variations(self, player_name: str) -> List[str]:
-        variations = []
-        player_name = player_name.lower().strip()
 
-        variations.append(player_name.replace("jr", "").replace("Jr", ""))
+def _team_ids() -> Dict[str, int]:
+    return _team_index.get()
 
-        name_parts = player_name.split()
-        if len(name_parts) > 1:
-            variations.append(f"{name_parts[0]} {name_parts[-1]}")
 
-        if len(name_parts) == 2:
-            variations.append(f"{name_parts[1]} {name_parts[0]}")
+class MLBDataService:
+    def __init__(self, cache_dir: Optional[str] = None):
+        # diskcache expires entries itself; values are pickled
+        self.cache = diskcache.Cache(cache_dir or DEFAULT_CACHE_DIR)
+        # Each kind of data goes stale at its own pace: a player's id never changes
+        # (None: no expiry), season totals move once per game, recent games matter
+        # while one is live
+        self.info_ttl: Optional[timedelta] = None
+        self.season_ttl = timedelta(minutes=30)
+        # Season stats while the player's team is on the field; once its games are
+        # over (or it has none) they hold until midnight, see _season_ttl_for
+        self.live_season_ttl = timedelta(minutes=5)
+        self.recent_ttl = timedelta(minutes=5)
+        self.schedule_ttl = timedelta(minutes=5)
+        # Finished games are cached with no expiry; live ones only briefly
+        self.live_boxscore_ttl = timedelta(seconds=30)
+        # Unknown names are remembered briefly so typos don't repeat every lookup call
+        self.negative_ttl = timedelta(minutes=5)
+        # How many of the team's latest games make up "recent" performance
+        self.recent_games_window = 10
+        # Seconds a multi-player lookup waits before giving up on slow players
+        self.batch_timeout = 30
+        # One pool for the service's fan-out HTTP calls (boxscores), instead of a new
+        # pool per request. Only leaf calls go here; tasks must never wait on it.
+        self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="mlb-fetch")
+        # Whole get_player_data calls for multi-player lookups; kept apart from the
+        # fetch pool because each of these tasks waits on boxscore fetches there
+        self._player_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="mlb-player")
+        # cache_key -> pending get_player_data future, shared by concurrent callers
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def get_player_data(self, player_name: str, now: Optional[datetime] = None) -> Optional[Dict]:
+        """
+        Formatted stats for a player, or None if the name can't be resolved
+
+        Args:
+            player_name: Player's name, in any spelling _fold_name accepts
+            now: Clock reading to format against; batch callers pass one shared
+                value instead of reading the clock per player
+        """
+        try:
+            cache_key = _player_cache_key(player_name)
+
+            player_id = self.cache.get(f"{cache_key}_info")
+            if player_id is None:
+                if f"{cache_key}_missing" in self.cache:
+                    return None
+                player_id = self._get_player_id(player_name)
+                if not player_id:
+                    logger.warning(f"Player not found: {player_name}")
+                    self._cache_set(f"{cache_key}_missing", True, self.negative_ttl)
+                    return None
+                self._cache_set(f"{cache_key}_info", player_id, self.info_ttl)
+
+            player_data = self.cache.get(f"{cache_key}_season")
+            if player_data is None:
+                player_data = self._fetch_player_stats(player_id)
+                if not player_data:
+                    logger.warning(f"No stats found for {player_name}")
+                    return None
+                team_id = player_data.get("player_info", {}).get("currentTeam", {}).get("id")
+                self._cache_set(
+                    f"{cache_key}_season", player_data, self._season_ttl_for(team_id, now)
+                )
 
-        return list(set(variations))
+            return self._format_player_data(player_data, player_name, now)
+        except Exception as e:
+            logger.error(f"Error fetching {player_name} data: {e}")
+            return None
+
+    def close(self) -> None:
+        """Stop the fetch pool and close the on-disk cache"""
+        self._player_executor.shutdown(wait=False)
+        self._executor.shutdown(wait=False)
+        self.cache.close()
+
+    def _cache_set(self, key: str, value, ttl: Optional[timedelta]) -> None:
+        self.cache.set(key, value, expire=ttl.total_seconds() if ttl else None)
+
+    async def get_player_data_async(self, player_name: str) -> Optional[Dict]:
+        """
+        Awaitable get_player_data for the async routes
+
+        The statsapi calls run in the default executor so the event loop stays
+        free, and concurrent requests for the same player share one fetch.
+        """
+        cache_key = _player_cache_key(player_name)
+        pending = self._in_flight.get(cache_key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(None, self.get_player_data, player_name)
+            self._in_flight[cache_key] = pending
+            pending.add_done_callback(lambda _: self._in_flight.pop(cache_key, None))
+        # shield: one cancelled request must not cancel the fetch for the others
+        return await asyncio.shield(pending)
+
+    def _get_player_id(self, player_name: str) -> Optional[int]:
+        """
+        Id for a player name, or None when the MLB API knows no such player
+
+        API errors propagate instead of returning None, so an outage is never
+        cached as "player not found".
+        """
+        if _player_index.is_loaded:
+            player_id = _player_index.match_id(player_name)
+            if player_id:
+                return player_id
+
+        # Not an active player (or no index yet): the API also knows retired players
+        players = statsapi.lookup_player(player_name)
+        if players:
+            return players[0]["id"]
+        return None
 
     def _get_team_id_from_name(self, team_name: str) -> Optional[int]:
         """Get team ID from team name"""
-        team_id_map = {
-            "Los Angeles Angels": 108,
-            "Los Angeles Dodgers": 119,
-            "New York Yankees": 147,
-            "Boston Red Sox": 111,
-            # Add more teams as needed
-        }
-        return team_id_map.get(team_name)
+        return _team_ids().get(team_name)
 
     def _fetch_player_stats(self, player_id: int) -> Optional[Dict]:
         try:
-            # Get current season stats
-            season_stats = statsapi.player_stat_data(
-                player_id, group="hitting,pitching,fielding", type="season"
+            # Season totals only: recent form comes from boxscores, so the game log
+            # would be downloaded and cached without ever being read
+            season_stats = _fetch_person_stats(
+                player_id, self._stat_groups_for(player_id), "[season]"
             )
 
-            # Get recent game log (last 15 games)
-            try:
-                game_log = statsapi.player_stat_data(
-                    player_id, group="hitting,pitching", type="gameLog"
-                )
-            except:
-                game_log = None
-
             # Get player info - reconstruct from season_stats data which is more reliable
             player_info = {
                 "id": season_stats.get("id"),
                 "fullName": f"{season_stats.get('first_name', '')} {season_stats.get('last_name', '')}".strip(),
                 "primaryPosition": {"abbreviation": season_stats.get("position", "")},
-                "currentTeam": {"name": season_stats.get("current_team", ""), "id": self._get_team_id_from_name(season_stats.get("current_team", ""))}
+                "currentTeam": {
+                    "name": season_stats.get("current_team", ""),
+                    "id": season_stats.get("current_team_id")
+                    or self._get_team_id_from_name(season_stats.get("current_team", "")),
+                },
             }
 
             return {
                 "season_stats": season_stats,
-                "game_log": game_log,
                 "player_info": player_info,
             }
 
@@ -112,57 +519,63 @@ class MLBDataService:
             logger.error(f"Error fetching stats for player ID {player_id}: {e}")
             return None
 
-    def _format_player_data(self, raw_data: Dict, player_name: str) -> Dict:
+    def _stat_groups_for(self, player_id: int) -> str:
+        """
+        Stat groups worth requesting for a player
+
+        Fielding is never read. When the active-player index knows the position, only
+        the group that matches it is requested; otherwise (and for two-way players)
+        both hitting and pitching.
+        """
+        position = _player_index.positions.get(player_id)
+        if position == "P":
+            return "[pitching]"
+        if position and position != "TWP":
+            return "[hitting]"
+        return "[hitting,pitching]"
+
+    def _format_player_data(
+        self, raw_data: Dict, player_name: str, now: Optional[datetime] = None
+    ) -> Dict:
+        # One clock read per request, shared by every date-dependent field below
+        now = now or datetime.now()
         try:
-            season_stats = raw_data.get("season_stats", {})
-            game_log = raw_data.get("game_log", {})
-            player_info = raw_data.get("player_info", {})
+            season_stats = raw_data.get("season_stats") or {}
+            player_info = raw_data.get("player_info") or {}
+            current_team = player_info.get("currentTeam") or {}
+
+            # Index the season splits by group once instead of scanning per field
+            by_group = {
+                stat_group.get("group"): stat_group.get("stats", {})
+                for stat_group in season_stats.get("stats") or ()
+            }
+            hitting_season = by_group.get("hitting", {})
+            pitching_season = by_group.get("pitching", {})
 
-            # Extract hitting stats from the new API structure
-            hitting_season = {}
-            pitching_season = {}
-            
-            if season_stats and 'stats' in season_stats:
-                for stat_group in season_stats['stats']:
-                    if stat_group.get('group') == 'hitting':
-                        hitting_season = stat_group.get('stats', {})
-                    elif stat_group.get('group') == 'pitching':
-                        pitching_season = stat_group.get('stats', {})
-
-            # Get team ID and player ID for recent performance
-            # First try from player_info (lookup result), then from season_stats
-            team_id = None
-            player_id = None
-            
-            if player_info:
-                team_id = player_info.get("currentTeam", {}).get("id")
-                player_id = player_info.get("id")
-            
-            # If not found in player_info, check season_stats which has the MLB API data
-            if not team_id and season_stats:
-                player_id = season_stats.get("id")
-                # Team ID 108 is Angels (hardcoded for now, could be improved)
-                if season_stats.get("current_team") == "Los Angeles Angels":
-                    team_id = 108
-            
-            hitting_recent = self._extract_recent_performance(player_id, team_id) if player_id and team_id else {}
+            # Lookup result first, then the MLB API payload in season_stats
+            team_id = current_team.get("id")
+            player_id = player_info.get("id") or season_stats.get("id")
 
-            is_pitcher = bool(pitching_season.get("gamesStarted", 0) > 0 or pitching_season.get("appearances", 0) > 0)
+            hitting_recent = self._extract_recent_performance(player_id, team_id, now) if player_id and team_id else {}
+
+            is_pitcher = bool(pitching_season.get("gamesStarted", 0) > 0 or pitching_season.get("gamesPitched", 0) > 0)
 
             formatted_data = {
                 "recent_games": self._format_recent_games(hitting_recent, is_pitcher),
                 "season_stats": self._format_season_stats(
-                    hitting_season, pitching_season, is_pitcher
+                    hitting_season, pitching_season, is_pitcher, now.year
                 ),
+                "season_totals": self._season_totals(hitting_season, is_pitcher),
                 "context": self._generate_context(season_stats, hitting_season, pitching_season),
                 "advanced": self._format_advanced_metrics(
                     hitting_season, hitting_recent, is_pitcher
                 ),
-                "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "last_updated": now_str(now),
                 "player_info": {
-                    "position": season_stats.get("position", player_info.get("primaryPosition", {}).get("abbreviation", "N/A")),
-                    "team": season_stats.get("current_team", player_info.get("currentTeam", {}).get("name", "N/A")),
-                    "age": hitting_season.get("age", self._calculate_age(player_info.get("birthDate", ""))),
+                    "position": season_stats.get("position")
+                    or (player_info.get("primaryPosition") or {}).get("abbreviation", "N/A"),
+                    "team": season_stats.get("current_team") or current_team.get("name", "N/A"),
+                    "age": hitting_season.get("age", self._calculate_age(player_info.get("birthDate", ""), now)),
                 },
             }
 
@@ -176,76 +589,152 @@ class MLBDataService:
                 "season_stats": "Season statistics unavailable",
                 "context": "Player context unavailable",
                 "advanced": "Advanced metrics unavailable",
-                "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "last_updated": now_str(now),
                 "player_info": {"position": "N/A", "team": "N/A", "age": "N/A"},
             }
 
-    def _extract_recent_performance(self, player_id: int, team_id: int) -> Dict:
+    def _extract_recent_performance(
+        self, player_id: int, team_id: int, now: Optional[datetime] = None
+    ) -> Dict:
         """Extract recent game performance using schedule + boxscore data"""
+        cache_key = f"recent_{player_id}_{team_id}_{self.recent_games_window}"
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             # Get recent games for the player's team
-            end_date = datetime.now()
+            end_date = now or datetime.now()
             start_date = end_date - timedelta(days=21)  # Last 3 weeks
             
-            schedule = statsapi.schedule(
-                start_date=start_date.strftime('%Y-%m-%d'),
-                end_date=end_date.strftime('%Y-%m-%d'),
-                team=team_id
+            schedule = self._get_team_schedule(
+                team_id, start_date.date().isoformat(), end_date.date().isoformat()
             )
-            
-            recent_games = []
-            for game in schedule[-10:]:  # Last 10 games
-                try:
-                    game_id = game['game_id']
-                    boxscore = statsapi.boxscore_data(game_id)
-                    
-                    # Determine if player's team was home or away
-                    is_away = game.get('away_id') == team_id
-                    batters = boxscore.get('awayBatters', []) if is_away else boxscore.get('homeBatters', [])
-                    
-                    # Find the player in the game
-                    for batter in batters:
-                        if batter.get('personId') == player_id:
-                            game_stats = {
-                                'date': game['game_date'],
-                                'ab': int(batter.get('ab', 0)),
-                                'h': int(batter.get('h', 0)),
-                                'hr': int(batter.get('hr', 0)),
-                                'rbi': int(batter.get('rbi', 0)),
-                                'bb': int(batter.get('bb', 0)),
-                                'k': int(batter.get('k', 0))
-                            }
-                            recent_games.append(game_stats)
-                            break
-                except Exception as e:
-                    logger.warning(f"Error getting boxscore for game {game_id}: {e}")
+
+            # Boxscores are independent HTTP calls; fetch the window concurrently
+            games = schedule[-self.recent_games_window:]
+            results = self._executor.map(
+                lambda game: self._fetch_one_boxscore(game, player_id, team_id), games
+            )
+            # Running totals in one pass over the games the player appeared in
+            games_played = total_ab = total_hits = total_hr = total_rbi = 0
+            for game_stats in results:
+                if not game_stats:
                     continue
-            
-            if not recent_games:
+                games_played += 1
+                total_ab += game_stats['ab']
+                total_hits += game_stats['h']
+                total_hr += game_stats['hr']
+                total_rbi += game_stats['rbi']
+
+            if not games_played:
                 return {}
-            
-            # Calculate totals from recent games
-            total_ab = sum(game['ab'] for game in recent_games)
-            total_hits = sum(game['h'] for game in recent_games)
-            total_hr = sum(game['hr'] for game in recent_games)
-            total_rbi = sum(game['rbi'] for game in recent_games)
-            
+
             avg = round(total_hits / total_ab, 3) if total_ab > 0 else 0
             
-            return {
-                "games": len(recent_games),
-                "attempted": 10,
+            recent = {
+                "games": games_played,
+                "attempted": len(games),
                 "avg": avg,
                 "hr": total_hr,
                 "rbi": total_rbi,
                 "hits": total_hits,
                 "ab": total_ab,
             }
-            
+            self._cache_set(cache_key, recent, self.recent_ttl)
+            return recent
+
         except Exception as e:
             logger.error(f"Error extracting recent performance: {e}")
             return {}
 
+    def _season_ttl_for(self, team_id: Optional[int], now: Optional[datetime] = None) -> timedelta:
+        """
+        How long a player's season stats can be cached, from the team's games today
+
+        Stats only move while the team is playing: short TTL during a game, the
+        usual TTL before first pitch, and until midnight on an off day or once
+        every game is final.
+        """
+        if not team_id:
+            return self.season_ttl
+        now = now or datetime.now()
+        today = now.date().isoformat()
+        try:
+            games = self._get_team_schedule(team_id, today, today)
+        except Exception as e:
+            logger.error(f"Error fetching today's schedule for team {team_id}: {e}")
+            return self.season_ttl
+
+        statuses = {_game_status(game) for game in games}
+        settled = _FINAL_GAME_STATUSES | _NO_PLAY_STATUSES
+        if statuses - settled - _PREGAME_STATUSES:
+            return self.live_season_ttl
+        if statuses & _PREGAME_STATUSES:
+            return self.season_ttl
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return midnight - now
+
+    def _get_team_schedule(self, team_id: int, start_date: str, end_date: str) -> List[Dict]:
+        """Team schedule for a date range, shared by every player on the team"""
+        cache_key = f"schedule_{team_id}_{start_date}_{end_date}"
+        schedule = self.cache.get(cache_key)
+        if schedule is None:
+            schedule = statsapi.schedule(start_date=start_date, end_date=end_date, team=team_id)
+            self._cache_set(cache_key, schedule, self.schedule_ttl)
+        return schedule
+
+    def _get_boxscore(self, game: Dict) -> Dict:
+        """Batting lines for a game, cached forever once the game is final"""
+        game_id = game.get('game_id')
+        cache_key = f"boxscore_{game_id}"
+        boxscore = self.cache.get(cache_key)
+        status = _game_status(game)
+        is_final = status in _FINAL_GAME_STATUSES
+        logger.debug(
+            "Boxscore %s (%s): %s",
+            game_id,
+            "final" if is_final else "live",
+            "hit" if boxscore is not None else "miss",
+        )
+        if boxscore is None:
+            boxscore = _fetch_boxscore_batters(game_id)
+            if is_final:
+                self.cache.set(cache_key, boxscore)
+            elif status in _NO_PLAY_STATUSES:
+                # Halted until a later day; nothing changes before the next schedule check
+                self._cache_set(cache_key, boxscore, self.schedule_ttl)
+            else:
+                self._cache_set(cache_key, boxscore, self.live_boxscore_ttl)
+        return boxscore
+
+    def _fetch_one_boxscore(self, game: Dict, player_id: int, team_id: int) -> Optional[Dict]:
+        """The player's batting line from one game, or None if absent or unavailable"""
+        game_id = game.get('game_id')
+        try:
+            boxscore = self._get_boxscore(game)
+
+            # Determine if player's team was home or away
+            is_away = game.get('away_id') == team_id
+            batters = boxscore.get('awayBatters', []) if is_away else boxscore.get('homeBatters', [])
+
+            # Find the player in the game
+            for batter in batters:
+                if batter.get('personId') == player_id:
+                    return {
+                        'date': game['game_date'],
+                        'ab': int(batter.get('ab', 0)),
+                        'h': int(batter.get('h', 0)),
+                        'hr': int(batter.get('hr', 0)),
+                        'rbi': int(batter.get('rbi', 0)),
+                        'bb': int(batter.get('bb', 0)),
+                        'k': int(batter.get('k', 0))
+                    }
+            return None
+        except Exception as e:
+            logger.warning(f"Error getting boxscore for game {game_id}: {e}")
+            return None
+
     def _format_recent_games(self, recent_data: Dict, is_pitcher: bool) -> str:
         if not recent_data:
             return "Recent game data not available"
@@ -272,16 +761,18 @@ class MLBDataService:
                 return f"Last {games} games of {attempted} attempted: .{int(avg*1000):03d} avg, {hr} HR, {rbi} RBI, {hits}/{ab} H/AB"
 
 
-    def _format_season_stats(self, hitting: Dict, pitching: Dict, is_pitcher: bool) -> str:
-        current_year = datetime.now().year
+    def _format_season_stats(
+        self, hitting: Dict, pitching: Dict, is_pitcher: bool, current_year: Optional[int] = None
+    ) -> str:
+        current_year = current_year or datetime.now().year
 
         if is_pitcher and pitching:
             wins = pitching.get("wins", 0)
             losses = pitching.get("losses", 0)
-            era = round(pitching.get("era", 0), 2)
-            innings = round(pitching.get("inningsPitched", 0), 1)
-            strikeouts = pitching.get("strikeouts", 0)
-            walks = pitching.get("walks", 0)
+            era = round(_as_number(pitching.get("era", 0)), 2)
+            innings = round(_as_number(pitching.get("inningsPitched", 0)), 1)
+            strikeouts = pitching.get("strikeOuts", 0)
+            walks = pitching.get("baseOnBalls", 0)
             hits = pitching.get("hits", 0)
             earned_runs = pitching.get("earnedRuns", 0)
 
@@ -292,15 +783,27 @@ class MLBDataService:
             hr = hitting.get("homeRuns", 0)
             rbi = hitting.get("rbi", 0)
             games = hitting.get("gamesPlayed", 0)
-            # Handle avg as string (e.g., ".235") or convert to proper format
-            if isinstance(avg, str) and avg.startswith('.'):
-                avg_display = avg
-            else:
-                avg_display = f".{int(float(avg)*1000):03d}" if avg else ".000"
+            avg_display = self._format_avg(avg)
             return f"{current_year}: {avg_display} avg, {hr} HR, {rbi} RBI in {games} games"
 
         return f"{current_year}: Statistics unavailable"
 
+    def _format_avg(self, avg) -> str:
+        # Handle avg as string (e.g., ".235") or convert to proper format
+        if isinstance(avg, str) and avg.startswith('.'):
+            return avg
+        return f".{int(_as_number(avg)*1000):03d}" if avg else ".000"
+
+    def _season_totals(self, hitting: Dict, is_pitcher: bool) -> Dict[str, str]:
+        """Headline hitting numbers, pre-parsed so the chat path can answer without regex"""
+        if is_pitcher or not hitting:
+            return {}
+        return {
+            "hr": str(hitting.get("homeRuns", 0)),
+            "avg": self._format_avg(hitting.get("avg", "0")),
+            "rbi": str(hitting.get("rbi", 0)),
+        }
+
     def _generate_context(self, player_info: Dict, hitting: Dict, pitching: Dict) -> str:
         """Generate contextual information about the player"""
         contexts = []
@@ -312,24 +815,8 @@ class MLBDataService:
 
         # Performance context
         if hitting:
-            avg_str = hitting.get("avg", "0")
-            # Handle string format like ".235"
-            if isinstance(avg_str, str) and avg_str.startswith('.'):
-                avg = float(avg_str)
-            else:
-                avg = float(avg_str) if avg_str else 0
-
-            # MLB average is .240
-            if avg > 0.300:
-                contexts.append("Excellent batting average this season")
-            elif avg > 0.270:
-                contexts.append("Hitting well this season")
-            elif avg > 0.240:
-                contexts.append("Hitting OK this season")
-            elif avg > 0.210:
-                contexts.append("Hitting mid-range this season")
-            else:
-                contexts.append("Struggling at the plate this season")
+            avg = _as_number(hitting.get("avg", 0))
+            contexts.append(_AVG_CONTEXTS[bisect.bisect_left(_AVG_THRESHOLDS, avg)])
 
         # Add more contextual insights based on available data
         if not contexts:
@@ -361,30 +848,18 @@ class MLBDataService:
 
         return ", ".join(metrics) if metrics else "Advanced metrics unavailable"
 
-    def _calculate_age(self, birth_date: str) -> str:
+    def _calculate_age(self, birth_date: str, today: Optional[datetime] = None) -> str:
         """Calculate player age from birth date"""
+        if not birth_date or not _ISO_DATE_RE.match(birth_date):
+            return "N/A"
         try:
-            if not birth_date:
-                return "N/A"
-
-            birth = datetime.strptime(birth_date[:10], "%Y-%m-%d")
-            today = datetime.now()
-            age = today.year - birth.year
-
-            if today.month < birth.month or (today.month == birth.month and today.day < birth.day):
-                age -= 1
-
-            return str(age)
-        except:
+            birth = date.fromisoformat(birth_date[:10])
+        except ValueError:  # well-formed but impossible, e.g. month 13
             return "N/A"
 
-    def _is_cached_and_fresh(self, cache_key: str) -> bool:
-        """Check if cached data exists and is still fresh"""
-        if cache_key not in self.cache:
-            return False
-
-        cache_time = self.cache[cache_key]["timestamp"]
-        return datetime.now() - cache_time < self.cache_duration
+        today = today or datetime.now()
+        had_birthday = (today.month, today.day) >= (birth.month, birth.day)
+        return str(today.year - birth.year - (not had_birthday))
 
     def get_team_roster(self, team_name: str) -> Optional[List[Dict]]:
         """Get team roster - useful for team-based queries"""
@@ -401,6 +876,78 @@ class MLBDataService:
             logger.error(f"Error fetching roster for {team_name}: {e}")
             return None
 
+    def get_many_players(self, names: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        get_player_data for several players at once
+
+        Lookups run concurrently, so a cold batch costs about one player's latency
+        rather than one per name; warm names come straight from the cache. The
+        whole batch is formatted against one clock reading. Players still loading
+        after the batch timeout come back as None instead of failing the batch.
+        """
+        now = datetime.now()
+        futures = {name: self._player_executor.submit(self.get_player_data, name, now) for name in names}
+        done, pending = wait(futures.values(), timeout=self.batch_timeout)
+        if pending:
+            logger.warning(f"{len(pending)} of {len(names)} player lookups timed out")
+
+        players = {}
+        for name, future in futures.items():
+            players[name] = future.result() if future in done and future.exception() is None else None
+        return players
+
+    def get_team_player_data(self, team_name: str) -> Optional[Dict[str, Optional[Dict]]]:
+        """Player data for everyone on a team's active roster, keyed by player name"""
+        try:
+            teams = statsapi.lookup_team(team_name)
+            if not teams:
+                return None
+
+            response = statsapi.get(
+                "team_roster",
+                {"teamId": teams[0]["id"], "rosterType": "active", "fields": "roster,person,fullName"},
+            )
+            names = [entry["person"]["fullName"] for entry in response.get("roster", [])]
+            return self.get_many_players(names)
+
+        except Exception as e:
+            logger.error(f"Error fetching player data for {team_name}: {e}")
+            return None
+
+    def refresh_active_players(self) -> int:
+        """Download the active player list once and rebuild the local name index"""
+        try:
+            count = _player_index.refresh()
+            logger.info(f"Loaded {count} active players into the name index")
+            return count
+        except Exception as e:
+            logger.error(f"Error loading active player list: {e}")
+            return 0
+
+    def has_player_index(self) -> bool:
+        return _player_index.is_loaded
+
+    def first_name_tokens(self) -> Optional[FrozenSet[str]]:
+        """Folded first names of active players, or None before the index has loaded"""
+        return _player_index.first_names if _player_index.is_loaded else None
+
+    def find_player_names(self, text: str) -> List[str]:
+        """Full names of active players mentioned in the text, found without any API call"""
+        return _player_index.find_names(text)
+
+    def is_active_player_name(self, name: str) -> bool:
+        """Exact (accent/case-insensitive) match against the active player list"""
+        return _fold_name(name) in _player_index.names
+
+    def could_be_player_name(self, name: str) -> bool:
+        """True when every word of the name appears in some active player's name"""
+        tokens = _fold_name(name).split()
+        return bool(tokens) and all(token in _player_index.tokens for token in tokens)
+
+    def check_connection(self) -> None:
+        """Make one cheap MLB API call; raises if the API can't be reached"""
+        statsapi.latest_season()
+
     def search_players(self, query: str) -> List[Dict]:
         """Search for multiple players - useful for disambiguation"""
         try:
@@ -411,7 +958,12 @@ class MLBDataService:
             return []
 
 
+@functools.lru_cache(maxsize=1)
+def get_default_service() -> MLBDataService:
+    """Process-wide MLBDataService, so every caller shares one response cache"""
+    return MLBDataService()
+
+
 def get_player_data(player_name: str) -> Optional[Dict]:
     """Legacy function for backward compatibility"""
-    service = MLBDataService()
-    return service.get_player_data(player_name)
+    return get_default_service().get_player_data(player_name)
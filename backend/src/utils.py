@@ -0,0 +1,13 @@
+from datetime import datetime
+from typing import Optional
+
+
+def now_str(now: Optional[datetime] = None) -> str:
+    """
+    Current local time as "YYYY-MM-DD HH:MM:SS" for response timestamps
+
+    Built with an f-string since strftime re-parses its format string on every call.
+    Pass `now` to format a clock reading the caller already took.
+    """
+    n = now or datetime.now()
+    return f"{n.year:04d}-{n.month:02d}-{n.day:02d} {n.hour:02d}:{n.minute:02d}:{n.second:02d}"
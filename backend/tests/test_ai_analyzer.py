@@ -0,0 +1,632 @@
+"""Tests for the AI analyzer service."""
+
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from src.services import ai_analyzer
+from src.services import data_service as data_service_module
+from src.services.ai_analyzer import BaseballAnalyzer
+
+LONG_ANALYSIS = "Strong season so far with steady power numbers and improving plate discipline."
+
+
+class FakeCompletions:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.requests = []
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.requests.append(kwargs)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        message = SimpleNamespace(content=outcome)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture(autouse=True)
+def empty_response_cache(monkeypatch, tmp_path):
+    disk_cache = ai_analyzer.diskcache.Cache(str(tmp_path / "ai"))
+    monkeypatch.setattr(ai_analyzer, "_get_disk_cache", lambda: disk_cache)
+    ai_analyzer._response_cache.clear()
+    yield disk_cache
+    ai_analyzer._response_cache.clear()
+    disk_cache.close()
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    def install(*outcomes):
+        completions = FakeCompletions(outcomes)
+        client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        monkeypatch.setattr(ai_analyzer, "_get_client", lambda: client)
+        return completions
+
+    return install
+
+
+def test_get_ai_response_returns_content(fake_client):
+    completions = fake_client(LONG_ANALYSIS)
+    analyzer = BaseballAnalyzer()
+
+    result = asyncio.run(analyzer._get_ai_response("prompt"))
+
+    assert result == LONG_ANALYSIS
+    assert completions.calls == 1
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+
+    async def fake_sleep(delay):
+        recorded.append(delay)
+
+    monkeypatch.setattr(ai_analyzer.asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+def test_get_ai_response_retries_after_error(fake_client, sleeps):
+    completions = fake_client(RuntimeError("boom"), LONG_ANALYSIS)
+    analyzer = BaseballAnalyzer()
+
+    result = asyncio.run(analyzer._get_ai_response("prompt"))
+
+    assert result == LONG_ANALYSIS
+    assert completions.calls == 2
+    assert len(sleeps) == 1
+
+
+def test_rate_limit_backs_off_exponentially(fake_client, sleeps, monkeypatch):
+    monkeypatch.setattr(ai_analyzer, "_BACKOFF_JITTER", 0)
+    rate_limited = openai.RateLimitError("slow down", response=_fake_response(429), body=None)
+    fake_client(rate_limited, rate_limited, LONG_ANALYSIS)
+    analyzer = BaseballAnalyzer()
+
+    result = asyncio.run(analyzer._get_ai_response("prompt"))
+
+    assert result == LONG_ANALYSIS
+    assert sleeps == [0.5, 1.0]
+
+
+def test_rate_limit_honors_retry_after(fake_client, sleeps):
+    response = _fake_response(429, headers={"retry-after": "3"})
+    fake_client(openai.RateLimitError("slow down", response=response, body=None), LONG_ANALYSIS)
+    analyzer = BaseballAnalyzer()
+
+    asyncio.run(analyzer._get_ai_response("prompt"))
+
+    assert sleeps == [3.0]
+
+
+def test_rate_limit_caps_long_retry_after(fake_client, sleeps):
+    response = _fake_response(429, headers={"retry-after": "3600"})
+    fake_client(openai.RateLimitError("slow down", response=response, body=None), LONG_ANALYSIS)
+    analyzer = BaseballAnalyzer()
+
+    asyncio.run(analyzer._get_ai_response("prompt"))
+
+    assert sleeps == [ai_analyzer._MAX_BACKOFF]
+
+
+def test_get_ai_response_gives_up_on_auth_error(fake_client):
+    error = openai.AuthenticationError(
+        "bad key", response=_fake_response(401), body=None
+    )
+    completions = fake_client(error)
+    analyzer = BaseballAnalyzer()
+
+    result = asyncio.run(analyzer._get_ai_response("prompt"))
+
+    assert "authentication error" in result
+    assert completions.calls == 1
+
+
+def _fake_response(status_code, headers=None):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return httpx.Response(status_code, headers=headers or {}, request=request)
+
+
+def test_get_ai_response_serves_repeat_prompts_from_cache(fake_client):
+    completions = fake_client(LONG_ANALYSIS)
+    analyzer = BaseballAnalyzer()
+
+    first = asyncio.run(analyzer._get_ai_response("prompt"))
+    second = asyncio.run(analyzer._get_ai_response("prompt"))
+
+    assert first == second == LONG_ANALYSIS
+    assert completions.calls == 1
+
+
+def test_semantic_cache_matches_near_duplicate_questions():
+    cache = ai_analyzer._SemanticCache(threshold=0.95)
+    cache.store([1.0, 0.0, 0.1], ["Aaron Judge"], "Aaron Judge has 40 home runs", ttl=60)
+
+    assert cache.lookup([2.0, 0.0, 0.25], ["aaron judge"]) == "Aaron Judge has 40 home runs"
+    assert cache.lookup([0.0, 1.0, 0.0], ["Aaron Judge"]) is None
+
+
+def test_semantic_cache_checks_player_and_freshness(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(ai_analyzer.time, "monotonic", lambda: clock[0])
+    cache = ai_analyzer._SemanticCache(threshold=0.95)
+    cache.store([1.0, 0.0], ["Aaron Judge"], "Aaron Judge has 40 home runs", ttl=60)
+
+    assert cache.lookup([1.0, 0.0], ["Mike Trout"]) is None
+    clock[0] += 61
+    assert cache.lookup([1.0, 0.0], ["Aaron Judge"]) is None
+
+
+class FakeDataService:
+    def __init__(self, known_players, indexed_players=()):
+        self.known_players = known_players
+        self.indexed_players = {name.lower() for name in indexed_players}
+        self.searches = []
+
+    def has_player_index(self):
+        return bool(self.indexed_players)
+
+    def first_name_tokens(self):
+        if not self.indexed_players:
+            return None
+        return frozenset(player.split()[0] for player in self.indexed_players)
+
+    def find_player_names(self, text):
+        text = text.lower()
+        mentioned = [name for name in self.indexed_players if name in text]
+        return [name.title() for name in sorted(mentioned, key=text.find)]
+
+    def is_active_player_name(self, name):
+        return name.lower() in self.indexed_players
+
+    def could_be_player_name(self, name):
+        tokens = {token for player in self.indexed_players for token in player.split()}
+        return all(token in tokens for token in name.lower().split())
+
+    def search_players(self, query):
+        self.searches.append(query)
+        if query in self.known_players:
+            return [{"fullName": query}]
+        return []
+
+
+def test_extract_player_names_confirms_known_players():
+    data_service = FakeDataService({"Aaron Judge", "Mike Trout"})
+    analyzer = BaseballAnalyzer()
+
+    names = asyncio.run(
+        analyzer._extract_player_names("Who has more RBIs, aaron judge or Mike Trout?", data_service)
+    )
+
+    assert names == ["Aaron Judge", "Mike Trout"]
+
+
+def test_chat_question_without_players_skips_embedding(monkeypatch):
+    async def create(**kwargs):
+        pytest.fail("embedding requested")
+
+    client = SimpleNamespace(embeddings=SimpleNamespace(create=create))
+    monkeypatch.setattr(ai_analyzer, "_get_client", lambda: client)
+    analyzer = BaseballAnalyzer(data_service=FakeDataService(set()))
+
+    answer = asyncio.run(analyzer._answer_baseball_question("who won last night?"))
+
+    assert answer.startswith("I couldn't identify any player names")
+
+
+def test_extract_player_names_uses_index_before_searching():
+    data_service = FakeDataService(set(), indexed_players={"Aaron Judge", "Mike Trout"})
+    analyzer = BaseballAnalyzer()
+
+    names = asyncio.run(
+        analyzer._extract_player_names("Compare aaron judge and mike trout", data_service)
+    )
+
+    assert names == ["Aaron Judge", "Mike Trout"]
+    assert data_service.searches == []
+
+
+def test_extract_player_names_skips_parts_of_indexed_suffixed_names(monkeypatch, tmp_path):
+    monkeypatch.setattr(data_service_module.statsapi, "latest_season", lambda: {"seasonId": 2025})
+    monkeypatch.setattr(
+        data_service_module.statsapi,
+        "get",
+        lambda endpoint, params: {"people": [{"fullName": "Vladimir Guerrero Jr.", "id": 665489}]},
+    )
+    index = data_service_module._ActivePlayerIndex()
+    index.refresh()
+    monkeypatch.setattr(data_service_module, "_player_index", index)
+    service = data_service_module.MLBDataService(cache_dir=str(tmp_path))
+    monkeypatch.setattr(service, "search_players", lambda query: [{"fullName": query}])
+    analyzer = BaseballAnalyzer()
+
+    names = asyncio.run(
+        analyzer._extract_player_names("How many homers does Vladimir Guerrero Jr. have?", service)
+    )
+
+    assert names == ["Vladimir Guerrero Jr."]
+
+
+def test_format_stats_answer_reads_requested_stat():
+    analyzer = BaseballAnalyzer()
+    data = {"season_stats": "2025: .287 avg, 41 HR, 102 RBI in 140 games"}
+
+    hr_answer = analyzer._format_stats_answer("how many homers?", {"Aaron Judge": data})
+    rbi_answer = analyzer._format_stats_answer("Judge RBI total", {"Aaron Judge": data})
+
+    assert hr_answer.startswith("Aaron Judge has 41 home runs")
+    assert rbi_answer.startswith("Aaron Judge has 102 RBIs")
+
+
+def test_format_stats_answer_prefers_parsed_season_totals():
+    analyzer = BaseballAnalyzer()
+    data = {"season_stats": "Stats unavailable", "season_totals": {"avg": ".301"}}
+
+    answer = analyzer._format_stats_answer("what's his average", {"Mike Trout": data})
+
+    assert answer.startswith("Mike Trout is batting .301")
+
+
+def test_collect_batch_caches_completed_analyses(monkeypatch):
+    line = {
+        "custom_id": "cache-key",
+        "response": {
+            "status_code": 200,
+            "body": {"choices": [{"message": {"content": LONG_ANALYSIS}}]},
+        },
+    }
+
+    async def retrieve(batch_id):
+        return SimpleNamespace(status="completed", output_file_id="file-out")
+
+    async def content(file_id):
+        return SimpleNamespace(text=ai_analyzer.json.dumps(line) + "\n")
+
+    client = SimpleNamespace(
+        batches=SimpleNamespace(retrieve=retrieve),
+        files=SimpleNamespace(content=content),
+    )
+    monkeypatch.setattr(ai_analyzer, "_get_client", lambda: client)
+
+    stored = asyncio.run(BaseballAnalyzer().collect_batch("batch-1"))
+
+    assert stored == 1
+    assert asyncio.run(ai_analyzer._get_cached_response("cache-key")) == LONG_ANALYSIS
+
+
+def test_collected_batch_analysis_serves_realtime_requests_next_day(monkeypatch, fake_client):
+    completions = fake_client()
+    submitted = ai_analyzer._precomputed_key("Aaron Judge", ai_analyzer.date(2025, 6, 1))
+    asyncio.run(ai_analyzer._store_cached_response(submitted, LONG_ANALYSIS, ai_analyzer._BATCH_WINDOW_SECONDS))
+
+    class NextDay(ai_analyzer.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return ai_analyzer.datetime(2025, 6, 2, 9, 0, tzinfo=tz)
+
+    monkeypatch.setattr(ai_analyzer, "datetime", NextDay)
+    analyzer = BaseballAnalyzer()
+    fresh_data = {"recent_games": "Last 10 games: .350 avg"}
+
+    assert asyncio.run(analyzer.is_analysis_cached("aaron judge", fresh_data))
+    assert asyncio.run(analyzer._analyze_player_performance("aaron judge", fresh_data)) == LONG_ANALYSIS
+    assert completions.calls == 0
+
+
+def test_get_ai_response_accepts_per_call_overrides(fake_client):
+    completions = fake_client("Judge has 12 steals.")
+    analyzer = BaseballAnalyzer()
+
+    result = asyncio.run(
+        analyzer._get_ai_response(
+            "prompt", model="gpt-4o-mini", max_tokens=80, temperature=0, system="Be brief.", min_length=1
+        )
+    )
+
+    assert result == "Judge has 12 steals."
+    request = completions.requests[0]
+    assert request["model"] == "gpt-4o-mini"
+    assert request["max_tokens"] == 80
+    assert request["temperature"] == 0
+    assert request["messages"][0] == {"role": "system", "content": "Be brief."}
+
+
+def test_stat_question_makes_one_quick_attempt(fake_client, sleeps):
+    completions = fake_client(RuntimeError("down"), "unused")
+    analyzer = BaseballAnalyzer()
+
+    answer = asyncio.run(
+        analyzer._ask_stat_question("Is Judge hot?", "Aaron Judge", {"season_stats": ".287 avg"})
+    )
+
+    assert answer == ""
+    assert completions.calls == 1
+    assert completions.requests[0]["timeout"] == analyzer.qa_timeout
+    assert sleeps == []
+
+
+def test_candidate_names_follow_name_grammar():
+    words = ["how", "many", "homers", "does", "aaron", "judge", "have"]
+
+    assert ai_analyzer._candidate_names(words, frozenset({"aaron"})) == ["Aaron Judge"]
+
+
+def test_candidate_names_fold_accented_first_names():
+    names = ai_analyzer._candidate_names(["how", "is", "José", "ramirez"], frozenset({"jose"}))
+
+    assert names == ["José Ramirez"]
+
+
+def test_candidate_names_split_capitalized_runs_and_keep_suffixes():
+    words = ["Compare", "Vladimir", "Guerrero", "Jr", "and", "Mike", "Trout"]
+
+    candidates = ai_analyzer._candidate_names(words, frozenset({"vladimir", "mike"}))
+
+    assert "Vladimir Guerrero Jr" in candidates
+    assert "Mike Trout" in candidates
+    assert "And Mike" not in candidates
+
+
+def test_stream_ai_response_yields_chunks_and_caches_result(monkeypatch):
+    pieces = ["Strong season so far ", "with steady power numbers ", "and improving plate discipline."]
+
+    async def chunks():
+        for piece in pieces:
+            delta = SimpleNamespace(content=piece)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+        return chunks()
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(ai_analyzer, "_get_client", lambda: client)
+    analyzer = BaseballAnalyzer()
+
+    async def collect():
+        return [chunk async for chunk in analyzer._stream_ai_response("prompt")]
+
+    assert asyncio.run(collect()) == pieces
+    assert asyncio.run(collect()) == ["".join(pieces)]
+    assert asyncio.run(ai_analyzer._collect_stream(analyzer._stream_ai_response("prompt"))) == "".join(pieces)
+
+
+def test_analysis_prompt_clips_oversized_fields():
+    analyzer = BaseballAnalyzer()
+    player_data = {"recent_games": "x" * 5000, "season_stats": "2025: .250 avg"}
+
+    prompt = analyzer._create_analysis_prompt("Mike Trout", player_data)
+
+    assert "x" * 400 + "…" in prompt
+    assert "x" * 401 not in prompt
+    assert "Season Stats: 2025: .250 avg" in prompt
+
+
+def test_analysis_instructions_are_sent_as_a_shared_system_message(fake_client):
+    completions = fake_client(LONG_ANALYSIS, LONG_ANALYSIS)
+    analyzer = BaseballAnalyzer()
+
+    asyncio.run(analyzer._analyze_player_performance("Aaron Judge", {"season_stats": ".287 avg"}))
+    asyncio.run(analyzer._analyze_player_performance("Mike Trout", {"season_stats": ".250 avg"}))
+
+    first, second = (request["messages"] for request in completions.requests)
+    assert first[0] == second[0] == {"role": "system", "content": ai_analyzer._ANALYSIS_SYSTEM_PROMPT}
+    assert "ANALYSIS REQUIREMENTS" not in first[1]["content"]
+    assert "Player: Aaron Judge" in first[1]["content"]
+
+
+def test_comparisons_use_the_stronger_model(fake_client):
+    completions = fake_client(LONG_ANALYSIS, LONG_ANALYSIS)
+    analyzer = BaseballAnalyzer()
+
+    asyncio.run(analyzer._analyze_player_performance("Aaron Judge", {"season_stats": ".287 avg"}))
+    asyncio.run(analyzer._analyze_player_performance("Judge vs Trout", {"comparison_data": "..."}))
+
+    single, comparison = completions.requests
+    assert (single["model"], single["max_tokens"]) == (analyzer.model, analyzer.max_tokens)
+    assert (comparison["model"], comparison["max_tokens"]) == (
+        analyzer.comparison_model, analyzer.comparison_max_tokens
+    )
+    assert comparison["messages"][0]["content"] == ai_analyzer._COMPARISON_SYSTEM_PROMPT
+
+
+def test_is_analysis_cached_reflects_response_cache(fake_client):
+    fake_client(LONG_ANALYSIS)
+    analyzer = BaseballAnalyzer()
+    player_data = {"season_stats": "2025: .287 avg, 41 HR, 102 RBI in 140 games"}
+
+    assert asyncio.run(analyzer.is_analysis_cached("Aaron Judge", player_data)) is False
+    asyncio.run(analyzer._analyze_player_performance("Aaron Judge", player_data))
+    assert asyncio.run(analyzer.is_analysis_cached("Aaron Judge", player_data)) is True
+
+
+def test_analyze_player_reports_whether_it_was_cached(fake_client):
+    completions = fake_client(LONG_ANALYSIS)
+    analyzer = BaseballAnalyzer()
+    player_data = {"season_stats": "2025: .287 avg, 41 HR, 102 RBI in 140 games"}
+
+    assert asyncio.run(analyzer._analyze_player("Aaron Judge", player_data)) == (LONG_ANALYSIS, False)
+    assert asyncio.run(analyzer._analyze_player("Aaron Judge", player_data)) == (LONG_ANALYSIS, True)
+    assert completions.calls == 1
+
+
+def test_comparison_prompt_is_built_from_player_blocks():
+    analyzer = BaseballAnalyzer()
+    comparison = analyzer.format_comparison_data([
+        ("aaron judge", {"season_stats": "2025: .287 avg, 41 HR"}),
+        ("mike trout", {"recent_games": "Last 10 games: .310 avg"}),
+    ])
+
+    prompt = analyzer._create_comparison_prompt(comparison)
+
+    assert "Player 1: Aaron Judge\n2025: .287 avg, 41 HR\n" in prompt
+    assert "Player 2: Mike Trout\nStats unavailable\nRecent: Last 10 games: .310 avg\n" in prompt
+    assert "\n                " not in prompt
+
+
+def test_cached_responses_expire_after_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ai_analyzer.time, "monotonic", lambda: clock[0])
+    # diskcache checks expiry against the same (patched) time module
+    monkeypatch.setattr(ai_analyzer.time, "time", lambda: clock[0])
+
+    asyncio.run(ai_analyzer._store_cached_response("key", LONG_ANALYSIS))
+    clock[0] += ai_analyzer._RESPONSE_TTL_SECONDS - 1
+    assert asyncio.run(ai_analyzer._get_cached_response("key")) == LONG_ANALYSIS
+
+    clock[0] += 2
+    assert asyncio.run(ai_analyzer._get_cached_response("key")) is None
+
+
+def test_analyze_many_overlaps_requests_and_keeps_order(monkeypatch):
+    in_flight = []
+    peak = []
+
+    async def create(**kwargs):
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.05)
+        in_flight.pop()
+        player = kwargs["messages"][-1]["content"].split("Player: ")[1].split("\n")[0]
+        message = SimpleNamespace(content=f"{player}: {LONG_ANALYSIS}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(ai_analyzer, "_get_client", lambda: client)
+    data = {"season_stats": "2025: .287 avg"}
+
+    analyses = BaseballAnalyzer().analyze_many_sync([("aaron judge", data), ("mike trout", data)])
+
+    assert analyses[0].startswith("Aaron Judge:")
+    assert analyses[1].startswith("Mike Trout:")
+    assert max(peak) == 2
+
+
+def test_analyze_batch_combines_players_into_one_json_request(fake_client):
+    answer = {"analyses": {"Aaron Judge": LONG_ANALYSIS, "Mike Trout": LONG_ANALYSIS.upper()}}
+    completions = fake_client(json.dumps(answer))
+    data = {"season_stats": "2025: .287 avg"}
+
+    analyses = asyncio.run(
+        BaseballAnalyzer().analyze_batch([("aaron judge", data), ("mike trout", data)])
+    )
+
+    assert analyses == {"aaron judge": LONG_ANALYSIS, "mike trout": LONG_ANALYSIS.upper()}
+    assert completions.calls == 1
+    assert completions.requests[0]["response_format"] == {"type": "json_object"}
+    assert completions.requests[0]["max_tokens"] == 2 * ai_analyzer._MULTI_ANALYSIS_TOKENS_PER_PLAYER
+
+
+def test_analyze_batch_falls_back_to_single_requests(fake_client):
+    completions = fake_client(json.dumps({"analyses": {"Aaron Judge": LONG_ANALYSIS}}), LONG_ANALYSIS)
+    data = {"season_stats": "2025: .287 avg"}
+
+    analyses = asyncio.run(
+        BaseballAnalyzer().analyze_batch([("aaron judge", data), ("mike trout", data)])
+    )
+
+    assert analyses["mike trout"] == LONG_ANALYSIS
+    assert "response_format" not in completions.requests[1]
+
+
+def test_analyze_many_sync_can_run_repeatedly_past_the_concurrency_limit(monkeypatch):
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0)
+        message = SimpleNamespace(content=LONG_ANALYSIS)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(ai_analyzer, "_get_client", lambda: client)
+    analyzer = BaseballAnalyzer()
+    analyzer.max_concurrency = 2
+    # A semaphore left bound to the previous loop would only get through by retrying
+    analyzer.max_retries = 0
+    items = [(f"player {n}", {"season_stats": f"2025: .{n:03d} avg"}) for n in range(5)]
+
+    for _ in range(2):
+        calls.clear()
+        ai_analyzer._response_cache.clear()
+        ai_analyzer._get_disk_cache().clear()
+
+        assert analyzer.analyze_many_sync(items) == [LONG_ANALYSIS] * len(items)
+        assert len(calls) == len(items)
+
+
+def test_token_bucket_waits_for_refill(monkeypatch):
+    clock = [0.0]
+    waits = []
+
+    async def fake_sleep(delay):
+        waits.append(delay)
+        clock[0] += delay
+
+    monkeypatch.setattr(ai_analyzer.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(ai_analyzer.asyncio, "sleep", fake_sleep)
+    bucket = ai_analyzer._TokenBucket(tokens_per_minute=600)
+
+    async def spend():
+        await bucket.acquire(500)
+        await bucket.acquire(200)
+
+    asyncio.run(spend())
+
+    assert waits == [pytest.approx(10.0)]
+
+
+def test_request_slots_cap_concurrent_requests(monkeypatch):
+    in_flight = []
+    peak = []
+
+    async def create(**kwargs):
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        for _ in range(3):
+            await asyncio.sleep(0)
+        in_flight.pop()
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=LONG_ANALYSIS))])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(ai_analyzer, "_get_client", lambda: client)
+    analyzer = BaseballAnalyzer()
+    analyzer.max_concurrency = 2
+
+    async def run_many():
+        await asyncio.gather(*(analyzer._get_ai_response(f"prompt {i}") for i in range(5)))
+
+    asyncio.run(run_many())
+
+    assert max(peak) == 2
+
+
+def test_response_cache_falls_back_to_disk(empty_response_cache):
+    asyncio.run(ai_analyzer._store_cached_response("key", LONG_ANALYSIS))
+    ai_analyzer._response_cache.clear()
+
+    assert asyncio.run(ai_analyzer._get_cached_response("key")) == LONG_ANALYSIS
+    assert "key" in ai_analyzer._response_cache
+    assert empty_response_cache.get("key") == LONG_ANALYSIS
+
+
+def test_response_cache_reads_disk_off_the_event_loop(monkeypatch):
+    threads = []
+
+    class RecordingCache:
+        def get(self, key, expire_time=False):
+            threads.append(threading.current_thread())
+            return None, None
+
+    monkeypatch.setattr(ai_analyzer, "_get_disk_cache", lambda: RecordingCache())
+
+    assert asyncio.run(ai_analyzer._get_cached_response("key")) is None
+    assert threads and threads[0] is not threading.main_thread()
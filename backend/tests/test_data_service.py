@@ -0,0 +1,478 @@
+"""Tests for the MLB data service."""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from src.services import data_service
+from src.services.data_service import MLBDataService
+
+
+@pytest.fixture
+def player_index(monkeypatch):
+    index = data_service._ActivePlayerIndex()
+    names = ["Aaron Judge", "Ronald Acuña Jr.", "Mike Trout", "Will Smith", "Dominic Smith"]
+    index.names = {data_service._fold_name(name): name for name in names}
+    index.last_names = {"judge": "Aaron Judge", "acuna": "Ronald Acuña Jr.", "trout": "Mike Trout"}
+    index.max_name_words = 3
+    index.ids = {folded: player_id for player_id, folded in enumerate(index.names, start=1)}
+    index.choice_ids = list(index.ids.values())
+    index.choices = [data_service.utils.default_process(name) for name in index.ids]
+    index.tokens = frozenset(token for name in index.names for token in name.split())
+    monkeypatch.setattr(data_service, "_player_index", index)
+    return index
+
+
+def test_fold_name_strips_case_accents_punctuation_and_suffixes():
+    assert data_service._fold_name("  Ronald Acuña  Jr. ") == "ronald acuna"
+    assert data_service._fold_name("Travis d'Arnaud") == "travis darnaud"
+    assert data_service._fold_name("Cal Ripken III") == "cal ripken"
+    assert data_service._fold_name("Jrue Smith") == "jrue smith"
+
+
+def test_is_active_player_name_matches_folded_names(player_index):
+    service = MLBDataService()
+
+    assert service.has_player_index()
+    assert service.is_active_player_name("ronald acuna jr")
+    assert service.is_active_player_name("Ronald Acuna")
+    assert not service.is_active_player_name("Acuna Ronald")
+    assert service.could_be_player_name("Acuna Ronald")
+    assert not service.could_be_player_name("How Many")
+
+
+def test_find_player_names_scans_question_once(player_index):
+    service = MLBDataService()
+
+    found = service.find_player_names("Who has more RBIs, Judge or ronald acuna jr.?")
+
+    assert found == ["Aaron Judge", "Ronald Acuña Jr."]
+
+
+def test_find_player_names_ignores_lowercase_last_names(player_index):
+    service = MLBDataService()
+
+    assert service.find_player_names("is the judge right about smith?") == []
+
+
+def test_find_player_names_skips_sentence_initial_last_names_beside_full_names(player_index):
+    player_index.last_names["story"] = "Trevor Story"
+    service = MLBDataService()
+
+    assert service.find_player_names("Story time. How is Mike Trout doing?") == ["Mike Trout"]
+    assert service.find_player_names("Trout or Story?") == ["Mike Trout", "Trevor Story"]
+
+
+def test_legacy_get_player_data_reuses_one_service(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        MLBDataService, "get_player_data", lambda self, name: calls.append(self) or {"name": name}
+    )
+
+    data_service.get_player_data("Aaron Judge")
+    data_service.get_player_data("Mike Trout")
+
+    assert calls[0] is calls[1] is data_service.get_default_service()
+
+
+def test_extract_recent_performance_skips_failed_boxscores(monkeypatch, tmp_path):
+    schedule = [
+        {"game_id": game_id, "game_date": f"2025-06-0{game_id}", "away_id": 147}
+        for game_id in (1, 2, 3)
+    ]
+    batter = {"personId": 592450, "ab": "4", "h": "2", "hr": "1", "rbi": "3", "bb": "0", "k": "1"}
+
+    def fetch_batters(game_id):
+        if game_id == 2:
+            raise RuntimeError("timeout")
+        return {"awayBatters": [batter], "homeBatters": []}
+
+    monkeypatch.setattr(data_service.statsapi, "schedule", lambda **kwargs: schedule)
+    monkeypatch.setattr(data_service, "_fetch_boxscore_batters", fetch_batters)
+
+    recent = MLBDataService(cache_dir=str(tmp_path))._extract_recent_performance(592450, 147)
+
+    assert recent["games"] == 2
+    assert recent["attempted"] == 3
+    assert recent["hits"] == 4
+    assert recent["hr"] == 2
+    assert recent["avg"] == 0.5
+
+
+def test_get_player_data_async_shares_concurrent_fetches(monkeypatch):
+    calls = []
+
+    def get_player_data(self, name):
+        calls.append(name)
+        return {"name": name}
+
+    monkeypatch.setattr(MLBDataService, "get_player_data", get_player_data)
+    service = MLBDataService()
+
+    async def fetch_twice():
+        return await asyncio.gather(
+            service.get_player_data_async("Aaron Judge"),
+            service.get_player_data_async("aaron judge "),
+        )
+
+    first, second = asyncio.run(fetch_twice())
+
+    assert first == second == {"name": "Aaron Judge"}
+    assert calls == ["Aaron Judge"]
+    assert service._in_flight == {}
+
+
+def test_player_data_cache_is_shared_through_disk(monkeypatch, tmp_path):
+    lookups = []
+    monkeypatch.setattr(MLBDataService, "_get_player_id", lambda self, name: lookups.append(name) or 1)
+    monkeypatch.setattr(MLBDataService, "_fetch_player_stats", lambda self, player_id: {"id": player_id})
+    monkeypatch.setattr(MLBDataService, "_format_player_data", lambda self, raw, name, now: raw)
+
+    first = MLBDataService(cache_dir=str(tmp_path)).get_player_data("Aaron Judge")
+    second = MLBDataService(cache_dir=str(tmp_path)).get_player_data("aaron judge")
+
+    assert first == second == {"id": 1}
+    assert lookups == ["Aaron Judge"]
+
+
+def test_player_data_cache_key_ignores_accents_and_suffixes(monkeypatch, tmp_path):
+    lookups = []
+    monkeypatch.setattr(MLBDataService, "_get_player_id", lambda self, name: lookups.append(name) or 1)
+    monkeypatch.setattr(MLBDataService, "_fetch_player_stats", lambda self, player_id: {"id": player_id})
+    monkeypatch.setattr(MLBDataService, "_format_player_data", lambda self, raw, name, now: raw)
+
+    service = MLBDataService(cache_dir=str(tmp_path))
+    service.get_player_data("Ronald Acuña Jr.")
+    service.get_player_data("ronald acuna")
+
+    assert lookups == ["Ronald Acuña Jr."]
+
+
+def test_player_data_entries_use_their_own_ttl(monkeypatch, tmp_path):
+    monkeypatch.setattr(MLBDataService, "_get_player_id", lambda self, name: 592450)
+    monkeypatch.setattr(MLBDataService, "_fetch_player_stats", lambda self, player_id: {"id": player_id})
+    monkeypatch.setattr(MLBDataService, "_format_player_data", lambda self, raw, name, now: raw)
+    service = MLBDataService(cache_dir=str(tmp_path))
+
+    service.get_player_data("Aaron Judge")
+
+    _, info_expires = service.cache.get("player_aaron judge_info", expire_time=True)
+    _, season_expires = service.cache.get("player_aaron judge_season", expire_time=True)
+    assert info_expires is None
+    assert season_expires is not None
+
+
+def test_season_ttl_follows_todays_games(monkeypatch, tmp_path):
+    statuses = []
+    monkeypatch.setattr(
+        data_service.statsapi, "schedule", lambda **kwargs: [{"status": status} for status in statuses]
+    )
+    service = MLBDataService(cache_dir=str(tmp_path))
+    evening = datetime(2025, 6, 1, 20, 0)
+
+    def ttl_with(*today):
+        statuses[:] = today
+        service.cache.clear()
+        return service._season_ttl_for(147, evening)
+
+    assert ttl_with() == timedelta(hours=4)
+    assert ttl_with("Final") == timedelta(hours=4)
+    assert ttl_with("Final", "In Progress") == service.live_season_ttl
+    assert ttl_with("Scheduled") == service.season_ttl
+    assert ttl_with("Final: Tied", "Suspended: Rain") == timedelta(hours=4)
+    assert service._season_ttl_for(None, evening) == service.season_ttl
+
+
+def test_unknown_player_is_not_looked_up_again(monkeypatch, tmp_path):
+    lookups = []
+    monkeypatch.setattr(data_service.statsapi, "lookup_player", lambda name: lookups.append(name) or [])
+    service = MLBDataService(cache_dir=str(tmp_path))
+
+    assert service.get_player_data("Aaron Jugde") is None
+    calls_after_first = len(lookups)
+    assert service.get_player_data("aaron jugde") is None
+
+    assert calls_after_first > 0
+    assert len(lookups) == calls_after_first
+
+
+def test_failed_player_lookup_is_not_cached_as_missing(monkeypatch, tmp_path):
+    def lookup_player(name):
+        raise ConnectionError("statsapi down")
+
+    monkeypatch.setattr(data_service.statsapi, "lookup_player", lookup_player)
+    service = MLBDataService(cache_dir=str(tmp_path))
+    assert service.get_player_data("Aaron Judge") is None
+
+    monkeypatch.setattr(data_service.statsapi, "lookup_player", lambda name: [{"id": 592450}])
+    monkeypatch.setattr(MLBDataService, "_fetch_player_stats", lambda self, player_id: {"player_info": {}})
+    monkeypatch.setattr(MLBDataService, "_format_player_data", lambda self, data, name, now: {"name": name})
+
+    assert service.get_player_data("Aaron Judge") == {"name": "Aaron Judge"}
+
+
+def test_get_player_id_matches_index_without_lookup(player_index, monkeypatch):
+    monkeypatch.setattr(data_service.statsapi, "lookup_player", lambda name: pytest.fail(name))
+    service = MLBDataService()
+
+    assert service._get_player_id("Aaron Judge") == 1
+    assert service._get_player_id("Trout, Mike") == 3
+    assert service._get_player_id("Ronald Acuna") == 2
+
+
+def test_team_ids_cover_every_team_and_load_once(monkeypatch):
+    lookups = []
+    teams = [{"name": "Boston Red Sox", "id": 111}, {"name": "Seattle Mariners", "id": 136}]
+    monkeypatch.setattr(data_service, "_team_index", data_service._TeamIndex())
+    monkeypatch.setattr(data_service.statsapi, "lookup_team", lambda value: lookups.append(value) or teams)
+    service = MLBDataService()
+
+    assert service._get_team_id_from_name("Seattle Mariners") == 136
+    assert service._get_team_id_from_name("Boston Red Sox") == 111
+    assert lookups == [""]
+
+
+def test_failed_team_list_load_is_retried_after_a_pause(monkeypatch):
+    lookups = []
+
+    def lookup_team(value):
+        lookups.append(value)
+        raise ConnectionError("statsapi down")
+
+    index = data_service._TeamIndex()
+    monkeypatch.setattr(data_service, "_team_index", index)
+    monkeypatch.setattr(data_service.statsapi, "lookup_team", lookup_team)
+    service = MLBDataService()
+
+    assert service._get_team_id_from_name("Seattle Mariners") is None
+    assert service._get_team_id_from_name("Seattle Mariners") is None
+    assert len(lookups) == 1
+
+    index._failed_at -= index.retry_after
+    service._get_team_id_from_name("Seattle Mariners")
+    assert len(lookups) == 2
+
+
+def test_team_schedule_is_fetched_once_per_team(monkeypatch, tmp_path):
+    fetches = []
+    monkeypatch.setattr(
+        data_service.statsapi, "schedule", lambda **kwargs: fetches.append(kwargs) or []
+    )
+    service = MLBDataService(cache_dir=str(tmp_path))
+
+    service._extract_recent_performance(545361, 108)
+    service._extract_recent_performance(660271, 108)
+
+    assert len(fetches) == 1
+
+
+def test_final_boxscores_never_expire_but_live_ones_do(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        data_service, "_fetch_boxscore_batters", lambda game_id: {"awayBatters": [], "homeBatters": []}
+    )
+    service = MLBDataService(cache_dir=str(tmp_path))
+
+    service._get_boxscore({"game_id": 1, "status": "Final"})
+    service._get_boxscore({"game_id": 2, "status": "In Progress"})
+
+    _, final_expires = service.cache.get("boxscore_1", expire_time=True)
+    _, live_expires = service.cache.get("boxscore_2", expire_time=True)
+    assert final_expires is None
+    assert live_expires is not None
+
+
+def test_detailed_final_status_counts_as_final(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        data_service, "_fetch_boxscore_batters", lambda game_id: {"awayBatters": [], "homeBatters": []}
+    )
+    service = MLBDataService(cache_dir=str(tmp_path))
+
+    service._get_boxscore({"game_id": 1, "status": "Completed Early: Rain"})
+
+    _, expires = service.cache.get("boxscore_1", expire_time=True)
+    assert expires is None
+
+
+def test_fetch_boxscore_batters_reads_lineup_batting_lines(monkeypatch):
+    payload = {
+        "teams": {
+            "away": {
+                "batters": [592450, 650333],
+                "players": {
+                    "ID592450": {
+                        "battingOrder": "200",
+                        "stats": {"batting": {"atBats": 4, "hits": 2, "homeRuns": 1, "rbi": 3}},
+                    },
+                },
+            },
+            "home": {"batters": [], "players": {}},
+        }
+    }
+    response = SimpleNamespace(content=orjson.dumps(payload), raise_for_status=lambda: None)
+    requested = {}
+
+    def get(url, params, timeout):
+        requested.update(params)
+        return response
+
+    monkeypatch.setattr(data_service._http, "get", get)
+
+    batters = data_service._fetch_boxscore_batters(745000)
+
+    assert "atBats" in requested["fields"]
+    assert batters["homeBatters"] == []
+    assert batters["awayBatters"] == [
+        {"personId": 592450, "ab": 4, "h": 2, "hr": 1, "rbi": 3, "bb": 0, "k": 0}
+    ]
+
+
+def test_fetch_player_stats_requests_projected_season_totals(monkeypatch):
+    calls = []
+    response = {
+        "people": [{
+            "id": 592450,
+            "useName": "Aaron",
+            "lastName": "Judge",
+            "currentTeam": {"id": 147, "name": "New York Yankees"},
+            "primaryPosition": {"abbreviation": "RF"},
+            "stats": [
+                {
+                    "type": {"displayName": "season"},
+                    "group": {"displayName": "hitting"},
+                    "splits": [{"season": "2025", "stat": {"homeRuns": 41}}],
+                },
+            ],
+        }]
+    }
+    monkeypatch.setattr(
+        data_service.statsapi, "get", lambda endpoint, params: calls.append(params) or response
+    )
+
+    raw = MLBDataService()._fetch_player_stats(592450)
+
+    assert len(calls) == 1
+    assert "type=[season]," in calls[0]["hydrate"]
+    assert "homeRuns" in calls[0]["fields"].split(",")
+    assert raw["season_stats"]["stats"] == [
+        {"type": "season", "group": "hitting", "season": "2025", "stats": {"homeRuns": 41}}
+    ]
+    assert "game_log" not in raw
+    assert raw["player_info"]["currentTeam"] == {"name": "New York Yankees", "id": 147}
+
+
+def test_calculate_age_handles_birthdays_and_bad_dates(tmp_path):
+    service = MLBDataService(cache_dir=str(tmp_path))
+    today = datetime(2025, 4, 26)
+
+    assert service._calculate_age("1992-04-26", today) == "33"
+    assert service._calculate_age("1992-04-27T00:00:00", today) == "32"
+    assert service._calculate_age("1992-13-01", today) == "N/A"
+    assert service._calculate_age("", today) == "N/A"
+
+
+def test_season_stats_accept_string_pitching_rates(tmp_path):
+    service = MLBDataService(cache_dir=str(tmp_path))
+    pitching = {"wins": 3, "losses": 1, "era": "2.456", "inningsPitched": "40.1"}
+
+    line = service._format_season_stats({}, pitching, True, 2025)
+
+    assert "2.46 ERA, 40.1 IP" in line
+    assert "0 ERA" in service._format_season_stats({}, {"era": "-.--"}, True, 2025)
+
+
+def test_context_labels_batting_average_bands(tmp_path):
+    service = MLBDataService(cache_dir=str(tmp_path))
+
+    def context(avg):
+        return service._generate_context({}, {"avg": avg}, {})
+
+    assert context(".301") == "Excellent batting average this season"
+    assert context(".300") == "Hitting well this season"
+    assert context(".250") == "Hitting OK this season"
+    assert context(".210") == "Struggling at the plate this season"
+    assert context(".---") == "Struggling at the plate this season"
+
+
+def test_stat_groups_follow_known_position(player_index):
+    player_index.positions = {1: "RF", 2: "P", 3: "TWP"}
+    service = MLBDataService()
+
+    assert service._stat_groups_for(1) == "[hitting]"
+    assert service._stat_groups_for(2) == "[pitching]"
+    assert service._stat_groups_for(3) == "[hitting,pitching]"
+    assert service._stat_groups_for(99) == "[hitting,pitching]"
+
+
+def test_close_shuts_down_fetch_pool(tmp_path):
+    service = MLBDataService(cache_dir=str(tmp_path))
+
+    service.close()
+
+    with pytest.raises(RuntimeError):
+        service._executor.submit(print)
+
+
+def test_get_team_player_data_fans_out_over_roster(monkeypatch, tmp_path):
+    roster = {"roster": [{"person": {"fullName": "Mike Trout"}}, {"person": {"fullName": "Zach Neto"}}]}
+    monkeypatch.setattr(data_service.statsapi, "lookup_team", lambda name: [{"id": 108}])
+    monkeypatch.setattr(data_service.statsapi, "get", lambda endpoint, params: roster)
+    monkeypatch.setattr(MLBDataService, "get_player_data", lambda self, name, now=None: {"name": name})
+    service = MLBDataService(cache_dir=str(tmp_path))
+
+    players = service.get_team_player_data("Angels")
+
+    assert players == {"Mike Trout": {"name": "Mike Trout"}, "Zach Neto": {"name": "Zach Neto"}}
+
+
+def test_get_many_players_formats_against_one_clock_reading(monkeypatch, tmp_path):
+    readings = []
+    monkeypatch.setattr(MLBDataService, "get_player_data", lambda self, name, now=None: readings.append(now))
+    service = MLBDataService(cache_dir=str(tmp_path))
+
+    service.get_many_players(["Mike Trout", "Zach Neto", "Jo Adell"])
+
+    assert len(readings) == 3
+    assert readings[0] is not None
+    assert len(set(readings)) == 1
+
+
+def test_get_many_players_returns_none_for_slow_players(monkeypatch, tmp_path):
+    release = threading.Event()
+
+    def get_player_data(self, name, now=None):
+        if name == "Jo Adell":
+            release.wait(5)
+        return {"name": name}
+
+    monkeypatch.setattr(MLBDataService, "get_player_data", get_player_data)
+    service = MLBDataService(cache_dir=str(tmp_path))
+    service.batch_timeout = 0.1
+
+    try:
+        players = service.get_many_players(["Mike Trout", "Jo Adell"])
+    finally:
+        release.set()
+
+    assert players == {"Mike Trout": {"name": "Mike Trout"}, "Jo Adell": None}
+
+
+def test_statsapi_requests_share_the_pooled_session():
+    adapter = data_service._http.get_adapter("https://statsapi.mlb.com/api/v1/people")
+
+    assert data_service.statsapi.requests is data_service._http
+    assert adapter._pool_maxsize == 50
+    assert adapter.max_retries.total == 3
+
+
+def test_statsapi_responses_decode_with_orjson():
+    response = data_service.requests.Response()
+    response._content = orjson.dumps({"people": [{"id": 592450}]})
+
+    decoded = data_service._orjson_body(response).json()
+
+    assert decoded == {"people": [{"id": 592450}]}
+    assert data_service._orjson_body in data_service._http.hooks["response"]
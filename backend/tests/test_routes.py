@@ -0,0 +1,47 @@
+"""Tests for the API routes."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import routes
+from src.main import app
+
+
+class FakeMLBService:
+    def __init__(self, error=None):
+        self.error = error
+        self.probes = 0
+
+    def check_connection(self):
+        self.probes += 1
+        if self.error:
+            raise self.error
+
+
+@pytest.fixture
+def client():
+    routes._readiness.update(checked_at=None, error=None)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_health_makes_no_upstream_calls(client):
+    service = FakeMLBService()
+    app.dependency_overrides[routes.get_mlb_service] = lambda: service
+
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    assert service.probes == 0
+
+
+def test_readiness_probe_result_is_reused(client):
+    service = FakeMLBService(error=ConnectionError("statsapi down"))
+    app.dependency_overrides[routes.get_mlb_service] = lambda: service
+
+    first = client.get("/health/ready")
+    second = client.get("/health/ready")
+
+    assert first.status_code == second.status_code == 503
+    assert service.probes == 1
@@ -0,0 +1,18 @@
+"""Tests for shared helpers."""
+
+import re
+from datetime import datetime
+
+from src import utils
+
+
+def test_now_str_matches_strftime_format():
+    before = datetime.now().replace(microsecond=0)
+    stamp = utils.now_str()
+
+    assert re.fullmatch(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", stamp)
+    assert datetime.strptime(stamp, "%Y-%m-%d %H:%M:%S") >= before
+
+
+def test_now_str_formats_given_time():
+    assert utils.now_str(datetime(2025, 7, 4, 9, 5, 3)) == "2025-07-04 09:05:03"